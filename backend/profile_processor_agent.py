@@ -15,6 +15,7 @@ from typing import Dict, List, Any
 from dataclasses import dataclass, asdict, field
 import json
 import logging
+import re
 
 # Optional LLM support (WatsonX)
 from watsonx_utils import create_watsonx_llm
@@ -23,6 +24,10 @@ from langchain_core.messages import HumanMessage, SystemMessage
 
 logger = logging.getLogger(__name__)
 
+# Body of a fenced code block in LLM output, with or without a ```json tag
+_JSON_BLOCK_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+
 @dataclass
 class UserProfile:
     """Standardized User Profile dataclass for agent communication"""
@@ -232,13 +237,15 @@ Input: {input_text}
     # Extract JSON payload
     parsed: Dict[str, Any] = {}
     try:
-        # If model wrapped JSON in code fences, strip them
-        text = content.strip()
-        # Strip common fenced code variants like ```json ... ``` or ``` ... ```
-        if text.startswith("```"):
-            parts = text.split("```")
-            if len(parts) >= 3:
-                text = parts[1] if not parts[1].strip().startswith("json") else parts[2]
+        # If model wrapped JSON in code fences (```json ... ``` or ``` ... ```), take the fenced body.
+        # The usual single ```json block is sliced with partition; regex handles the rest.
+        _, fence, tail = content.partition("```json")
+        body, closed, _ = tail.partition("```")
+        if fence and closed:
+            text = body.strip()
+        else:
+            match = _JSON_BLOCK_RE.search(content)
+            text = match.group(1).strip() if match else content.strip()
         parsed = json.loads(text)
         logger.info("Parsed JSON successfully via primary path")
     except Exception as e:
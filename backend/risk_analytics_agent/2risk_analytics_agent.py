@@ -5,17 +5,15 @@ Specializes in analyzing user assessment data and generating risk blueprints.
 
 import json
 import logging
-import numpy as np
-from typing import Dict, Any, Optional, List, Tuple
-import re
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Tuple
 from datetime import datetime
 
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_ibm import ChatWatsonx
-
 from .base_agent import BaseAgent, AgentContext, AgentStatus
 from .utils.financial_ratios import FinancialRatioEngine
 
+if TYPE_CHECKING:
+    from langchain_ibm import ChatWatsonx
+
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +24,7 @@ class RiskAnalyticsAgent(BaseAgent):
     Combines personal financial data with market conditions to create comprehensive risk assessments. 
    """
     
-    def __init__(self, llm: ChatWatsonx):
+    def __init__(self, llm: "ChatWatsonx"):
         """Initialize Risk Analytics Agent with specialized prompts and configuration."""
         
         system_prompt = """
@@ -223,7 +221,7 @@ Format your response professionally with clear sections and actionable insights.
             ai_response = await self._call_llm_with_retry(messages)
             return ai_response
         except Exception as e:
-            logger.warning(f"AI analysis generation failed: {e}")
+            logger.warning("AI analysis generation failed: %s", e)
             return self._generate_fallback_analysis(assessment, ratios, risk_capacity, risk_tolerance, risk_requirement, risk_score)
     
     def _format_ratio_summary_for_ai(self, ratio_summary: Dict[str, Any]) -> str:
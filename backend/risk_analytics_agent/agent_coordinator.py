@@ -4,93 +4,174 @@ Orchestrates communication between specialized agents and manages the overall wo
 """
 
 import asyncio
+import copy
+import hashlib
+import json
 import logging
+import os
 import time
 import uuid
-from typing import Dict, Any, Optional, List
-from datetime import datetime
+from collections import Counter
+from dataclasses import replace
+from typing import Dict, Any, Optional, List, Literal, Tuple
+from datetime import datetime, timedelta
 
+import httpx
 from langchain_ibm import ChatWatsonx
 
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 from .base_agent import AgentContext, AgentResponse, AgentStatus
 from .risk_analytics_agent import RiskAnalyticsAgent
+from .session_store import create_session_store
 
 
 logger = logging.getLogger(__name__)
 
+# Concurrent workflows allowed for offline ("batch") processing
+BATCH_MAX_CONCURRENCY = 4
+
+# How often the background janitor prunes in-memory sessions
+SESSION_CLEANUP_INTERVAL_SECONDS = 300
+
+
+def create_shared_http_client() -> httpx.AsyncClient:
+    """Create the pooled keep-alive HTTP client shared by all LLM calls."""
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=50),
+        timeout=httpx.Timeout(connect=10, read=1800, write=1800, pool=1800)
+    )
+
 
 class AgentCoordinator:
     """
     Coordinates communication between specialized agents and manages workflow.
     Provides the main entry point for multi-agent portfolio analysis.
+    
+    Sessions may be stored in Redis, so the session queries (get_session_status,
+    get_agent_status and cleanup_old_sessions) are coroutines and must be
+    awaited; get_agent_status and cleanup_old_sessions used to be synchronous.
     """
     
-    def __init__(self, llm: ChatWatsonx):
+    def __init__(self, llm: ChatWatsonx, redis_url: Optional[str] = None, session_ttl_hours: int = 24,
+                 http_client: Optional[httpx.AsyncClient] = None):
         """
         Initialize Agent Coordinator with LLM and specialized agents.
         
         Args:
             llm: ChatWatsonx instance for AI processing
+            redis_url: Redis URL for shared session state (defaults to REDIS_URL;
+                sessions are kept in memory when neither is set)
+            session_ttl_hours: Lifetime of sessions stored in Redis
+            http_client: Pooled HTTP client used by the LLM, closed by aclose()
         """
         self.llm = llm
+        self._http_client = http_client
+        self._janitor: Optional[asyncio.Task] = None
+        
+        # Lifetime workflow counters for this process, kept up to date as sessions change
+        self._sessions_started = 0
+        self._session_status_counts: Counter = Counter()
+        
+        # Workflows currently running, keyed by request fingerprint, so identical
+        # concurrent requests share one run
+        self._inflight: Dict[str, asyncio.Future] = {}
         
         # Initialize specialized agents
         self.risk_agent = RiskAnalyticsAgent(llm)
         
         # Workflow state
-        self.active_sessions: Dict[str, Dict[str, Any]] = {}
+        self.sessions = create_session_store(
+            redis_url or os.getenv("REDIS_URL"),
+            ttl_seconds=session_ttl_hours * 3600
+        )
         
         logger.info("Agent Coordinator initialized with Risk Analytics Agent")
     
-    async def process_portfolio_request(self, assessment_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def process_portfolio_request(self, assessment_data: Dict[str, Any],
+                                        persist_result: bool = False) -> Dict[str, Any]:
         """
         Main entry point for portfolio generation workflow.
         Coordinates multiple agents to generate comprehensive portfolio recommendations.
         
         Args:
             assessment_data: User assessment data
+            persist_result: Keep the full results with the session for later retrieval.
+                Only honoured by the Redis session store; in-process sessions keep a
+                compact summary so the response is not held in memory twice.
             
         Returns:
             Dictionary with complete portfolio analysis results
         """
+        # Identical requests arriving while one is running (double submits, client
+        # retries) wait for that run instead of starting their own
+        request_key = self._request_key(assessment_data, persist_result)
+        workflow = self._inflight.get(request_key)
+        if workflow is None:
+            workflow = asyncio.ensure_future(self._run_portfolio_workflow(assessment_data, persist_result))
+            self._inflight[request_key] = workflow
+            workflow.add_done_callback(lambda _: self._inflight.pop(request_key, None))
+        else:
+            logger.info("Joining in-flight portfolio analysis for an identical request")
+        # Shield so a cancelled caller does not cancel the run other callers wait on;
+        # each caller gets its own copy of the shared results
+        return copy.deepcopy(await asyncio.shield(workflow))
+    
+    @staticmethod
+    def _request_key(assessment_data: Dict[str, Any], persist_result: bool) -> str:
+        """Fingerprint of a workflow request used to coalesce duplicates."""
+        payload = json.dumps([assessment_data, persist_result], sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+    
+    async def _run_portfolio_workflow(self, assessment_data: Dict[str, Any],
+                                      persist_result: bool) -> Dict[str, Any]:
+        """Run the agent workflow for one request (see process_portfolio_request)."""
         session_id = str(uuid.uuid4())
         start_time = time.time()
+        # Read the wall clock once; later timestamps are derived from the monotonic clock
+        session_clock = (datetime.fromtimestamp(start_time), time.monotonic())
         
-        logger.info(f"Starting portfolio analysis workflow for session {session_id}")
+        logger.info("Starting portfolio analysis workflow for session %s", session_id)
         
         try:
             # Create agent context
             context = AgentContext(
                 session_id=session_id,
                 user_assessment=assessment_data,
-                timestamp=datetime.now().isoformat()
+                timestamp=session_clock[0].isoformat()
             )
             
             # Initialize session tracking
-            self.active_sessions[session_id] = {
+            await self.sessions.create(session_id, {
                 "start_time": start_time,
-                "status": "processing",
-                "completed_agents": [],
-                "results": {}
-            }
+                "status": "processing"
+            })
+            self._sessions_started += 1
+            self._session_status_counts["processing"] += 1
             
             # Step 1: Risk Analysis
-            logger.info(f"Session {session_id}: Starting risk analysis")
+            logger.info("Session %s: Starting risk analysis", session_id)
             risk_response = await self._execute_agent_with_monitoring(
-                self.risk_agent, context, "risk_analysis"
+                self.risk_agent, context, "risk_analysis", session_clock
             )
             
             if not risk_response.success:
                 raise Exception(f"Risk analysis failed: {risk_response.error}")
             
             # Update context with risk analysis results
-            context.risk_profile = risk_response.structured_data
+            context = replace(context, risk_profile=risk_response.structured_data)
             
             # Step 2: Future agents (Portfolio Agent, Market Agent) would go here
             # For now, we'll focus on the risk analysis as the foundation
             
             # Compile final results
-            total_time = time.time() - start_time
+            total_time = time.monotonic() - session_clock[1]
+            session_data = await self.sessions.get(session_id) or {}
             
             final_results = {
                 "session_id": session_id,
@@ -108,30 +189,34 @@ class AgentCoordinator:
                     }
                 },
                 "workflow_metadata": {
-                    "completed_agents": self.active_sessions[session_id]["completed_agents"],
+                    "completed_agents": session_data.get("completed_agents", []),
                     "total_processing_time": total_time,
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": self._clock_timestamp(session_clock)
                 }
             }
             
             # Update session status
-            self.active_sessions[session_id]["status"] = "completed"
-            self.active_sessions[session_id]["results"] = final_results
+            session_update = {"status": "completed", "total_processing_time": total_time}
+            if persist_result and self.sessions.backend == "redis":
+                session_update["results"] = final_results
+            await self.sessions.update(session_id, session_update)
+            self._record_status_change("processing", "completed")
             
-            logger.info(f"Portfolio analysis workflow completed for session {session_id} in {total_time:.2f}s")
+            logger.info("Portfolio analysis workflow completed for session %s in %.2fs", session_id, total_time)
             
             return final_results
             
         except Exception as e:
             error_msg = str(e)
-            total_time = time.time() - start_time
+            total_time = time.monotonic() - session_clock[1]
             
-            logger.error(f"Portfolio analysis workflow failed for session {session_id}: {error_msg}")
+            logger.error("Portfolio analysis workflow failed for session %s: %s", session_id, error_msg)
             
             # Update session status
-            if session_id in self.active_sessions:
-                self.active_sessions[session_id]["status"] = "failed"
-                self.active_sessions[session_id]["error"] = error_msg
+            session_data = await self.sessions.get(session_id) or {}
+            if session_data:
+                await self.sessions.update(session_id, {"status": "failed", "error": error_msg})
+                self._record_status_change(session_data.get("status", "processing"), "failed")
             
             return {
                 "session_id": session_id,
@@ -139,16 +224,58 @@ class AgentCoordinator:
                 "error": error_msg,
                 "processing_time": total_time,
                 "workflow_metadata": {
-                    "completed_agents": self.active_sessions.get(session_id, {}).get("completed_agents", []),
+                    "completed_agents": session_data.get("completed_agents", []),
                     "total_processing_time": total_time,
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": self._clock_timestamp(session_clock)
                 }
             }
     
+    async def process_portfolio_request_batch(self, assessments: List[Dict[str, Any]],
+                                              mode: Literal["realtime", "batch"] = "realtime",
+                                              max_concurrency: int = BATCH_MAX_CONCURRENCY) -> List[Dict[str, Any]]:
+        """
+        Run the portfolio workflow for several assessments.
+        
+        "realtime" starts every workflow at once for interactive callers.
+        "batch" is meant for bulk jobs (scheduled refreshes, onboarding imports)
+        and caps the number of workflows in flight so the LLM endpoint sees a
+        steady load instead of a burst.
+        
+        Args:
+            assessments: User assessment data, one per workflow
+            mode: "realtime" or "batch"
+            max_concurrency: Workflows in flight at once in batch mode
+            
+        Returns:
+            Workflow results in the same order as the assessments
+        """
+        if mode == "realtime":
+            return await asyncio.gather(
+                *(self.process_portfolio_request(assessment) for assessment in assessments)
+            )
+        if mode != "batch":
+            raise ValueError(f"Unknown processing mode: {mode}")
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run(assessment: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.process_portfolio_request(assessment)
+        
+        logger.info("Processing %s assessments in batch mode (max %s concurrent)", len(assessments), max_concurrency)
+        return await asyncio.gather(*(run(assessment) for assessment in assessments))
+    
+    @staticmethod
+    def _clock_timestamp(session_clock: Tuple[datetime, float]) -> str:
+        """Current ISO timestamp derived from a session's (start datetime, start monotonic) pair."""
+        started_at, start_mono = session_clock
+        return (started_at + timedelta(seconds=time.monotonic() - start_mono)).isoformat()
+    
     async def _execute_agent_with_monitoring(self, 
                                            agent, 
                                            context: AgentContext, 
-                                           agent_type: str) -> AgentResponse:
+                                           agent_type: str,
+                                           session_clock: Optional[Tuple[datetime, float]] = None) -> AgentResponse:
         """
         Execute agent with monitoring and error handling.
         
@@ -156,6 +283,8 @@ class AgentCoordinator:
             agent: Agent instance to execute
             context: Agent context
             agent_type: Type identifier for the agent
+            session_clock: Session start as (datetime, monotonic time), used to
+                timestamp the run without reading the wall clock again
             
         Returns:
             AgentResponse with results
@@ -163,32 +292,42 @@ class AgentCoordinator:
         session_id = context.session_id
         
         try:
-            logger.info(f"Session {session_id}: Executing {agent_type} agent ({agent.name})")
+            logger.info("Session %s: Executing %s agent (%s)", session_id, agent_type, agent.name)
             
             # Execute agent
+            agent_start = time.monotonic()
             response = await agent.process(context)
+            agent_elapsed = time.monotonic() - agent_start
+            
+            if session_clock is None:
+                session_clock = (datetime.now() - timedelta(seconds=agent_elapsed), agent_start)
             
             # Update session tracking
-            if session_id in self.active_sessions:
-                self.active_sessions[session_id]["completed_agents"].append({
-                    "agent_name": agent.name,
-                    "agent_type": agent_type,
-                    "success": response.success,
-                    "processing_time": response.processing_time,
-                    "confidence": response.confidence,
-                    "timestamp": datetime.now().isoformat()
-                })
+            await self.sessions.append_agent(session_id, {
+                "agent_name": agent.name,
+                "agent_type": agent_type,
+                "success": response.success,
+                "processing_time": response.processing_time,
+                "confidence": response.confidence,
+                "elapsed_time": agent_elapsed,
+                "timestamp": self._clock_timestamp(session_clock)
+            })
             
             if response.success:
-                logger.info(f"Session {session_id}: {agent_type} completed successfully in {response.processing_time:.2f}s")
+                logger.info("Session %s: %s completed successfully in %.2fs", session_id, agent_type, response.processing_time)
             else:
-                logger.warning(f"Session {session_id}: {agent_type} failed: {response.error}")
+                logger.warning("Session %s: %s failed: %s", session_id, agent_type, response.error)
             
             return response
             
+        except asyncio.CancelledError:
+            # Cancellation is not an agent failure - let it reach the caller
+            logger.info("Session %s: %s cancelled", session_id, agent_type)
+            raise
+            
         except Exception as e:
             error_msg = str(e)
-            logger.error(f"Session {session_id}: {agent_type} execution failed: {error_msg}")
+            logger.error("Session %s: %s execution failed: %s", session_id, agent_type, error_msg)
             
             # Create error response
             return AgentResponse(
@@ -209,11 +348,10 @@ class AgentCoordinator:
         Returns:
             Session status information or None if not found
         """
-        if session_id not in self.active_sessions:
+        session_data = await self.sessions.get(session_id)
+        if session_data is None:
             return None
         
-        session_data = self.active_sessions[session_id]
-        
         return {
             "session_id": session_id,
             "status": session_data["status"],
@@ -223,27 +361,50 @@ class AgentCoordinator:
             "error": session_data.get("error")
         }
     
-    def get_agent_status(self) -> Dict[str, Any]:
-        """Get status of all agents in the coordinator."""
+    def _record_status_change(self, old_status: str, new_status: str) -> None:
+        """Move a session between status counters."""
+        self._session_status_counts[old_status] -= 1
+        self._session_status_counts[new_status] += 1
+    
+    async def get_agent_status(self, limit: int = 50) -> Dict[str, Any]:
+        """
+        Get status of all agents in the coordinator.
+        
+        A coroutine since the session store may be Redis; callers of the former
+        synchronous method need to await it.
+        
+        Args:
+            limit: Maximum number of (most recent) sessions in the session summary
+        """
+        now = time.time()
         return {
             "coordinator_status": "active",
-            "active_sessions": len(self.active_sessions),
+            "session_store": self.sessions.backend,
+            "active_sessions": await self.sessions.count(),
+            "sessions_total": self._sessions_started,
+            "sessions_by_status": {
+                status: count for status, count in self._session_status_counts.items() if count
+            },
             "agents": {
                 "risk_analytics": self.risk_agent.get_status()
             },
             "session_summary": {
                 session_id: {
                     "status": data["status"],
-                    "elapsed_time": time.time() - data["start_time"],
+                    "elapsed_time": now - data["start_time"],
                     "completed_agents": len(data["completed_agents"])
                 }
-                for session_id, data in self.active_sessions.items()
+                for session_id, data in await self.sessions.recent(limit)
             }
         }
     
-    def cleanup_old_sessions(self, max_age_hours: int = 24) -> int:
+    async def cleanup_old_sessions(self, max_age_hours: int = 24) -> int:
         """
         Clean up old sessions to prevent memory leaks.
+        Sessions stored in Redis expire through their TTL instead.
+        
+        A coroutine since the session store may be Redis; callers of the former
+        synchronous method need to await it.
         
         Args:
             max_age_hours: Maximum age of sessions to keep
@@ -251,22 +412,12 @@ class AgentCoordinator:
         Returns:
             Number of sessions cleaned up
         """
-        current_time = time.time()
-        max_age_seconds = max_age_hours * 3600
-        
-        sessions_to_remove = []
+        removed = await self.sessions.cleanup(max_age_hours * 3600)
         
-        for session_id, session_data in self.active_sessions.items():
-            if current_time - session_data["start_time"] > max_age_seconds:
-                sessions_to_remove.append(session_id)
+        if removed:
+            logger.info("Cleaned up %s old sessions", removed)
         
-        for session_id in sessions_to_remove:
-            del self.active_sessions[session_id]
-        
-        if sessions_to_remove:
-            logger.info(f"Cleaned up {len(sessions_to_remove)} old sessions")
-        
-        return len(sessions_to_remove)
+        return removed
     
     async def health_check(self) -> Dict[str, Any]:
         """
@@ -298,13 +449,48 @@ class AgentCoordinator:
             health_results["overall_health"] = "healthy" if all_agents_healthy else "degraded"
             
         except Exception as e:
-            logger.error(f"Health check failed: {e}")
+            logger.error("Health check failed: %s", e)
             health_results["coordinator"] = "error"
             health_results["error"] = str(e)
             health_results["overall_health"] = "unhealthy"
         
         return health_results
 
+    
+    async def _janitor_loop(self, interval: float = SESSION_CLEANUP_INTERVAL_SECONDS,
+                            max_age_hours: int = 24) -> None:
+        """Periodically remove old in-memory sessions."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.cleanup_old_sessions(max_age_hours)
+            except Exception as e:
+                logger.error("Session cleanup failed: %s", e)
+    
+    def start_session_janitor(self, interval: float = SESSION_CLEANUP_INTERVAL_SECONDS,
+                              max_age_hours: int = 24) -> None:
+        """
+        Start background cleanup of old sessions.
+        Not needed with the Redis session store, where sessions expire through their TTL.
+        """
+        if self.sessions.backend == "redis" or self._janitor is not None:
+            return
+        self._janitor = asyncio.create_task(self._janitor_loop(interval, max_age_hours))
+    
+    async def aclose(self) -> None:
+        """Stop the session janitor and release the shared HTTP connection pool."""
+        if self._janitor is not None:
+            self._janitor.cancel()
+            try:
+                await self._janitor
+            except asyncio.CancelledError:
+                pass
+            self._janitor = None
+        
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
 
 # Global coordinator instance
 _agent_coordinator: Optional[AgentCoordinator] = None
@@ -315,12 +501,13 @@ def get_agent_coordinator() -> Optional[AgentCoordinator]:
     return _agent_coordinator
 
 
-async def initialize_agent_coordinator(llm: ChatWatsonx) -> AgentCoordinator:
+async def initialize_agent_coordinator(llm: Optional[ChatWatsonx] = None) -> AgentCoordinator:
     """
     Initialize global agent coordinator.
     
     Args:
-        llm: ChatWatsonx instance
+        llm: ChatWatsonx instance; when omitted one is created on a pooled
+            keep-alive HTTP client that the coordinator owns
         
     Returns:
         Initialized AgentCoordinator
@@ -329,7 +516,15 @@ async def initialize_agent_coordinator(llm: ChatWatsonx) -> AgentCoordinator:
     
     logger.info("Initializing Agent Coordinator...")
     
-    coordinator = AgentCoordinator(llm)
+    http_client = None
+    if llm is None:
+        from watsonx_utils import create_watsonx_llm
+        
+        http_client = create_shared_http_client()
+        llm = create_watsonx_llm(async_httpx_client=http_client)
+    
+    coordinator = AgentCoordinator(llm, http_client=http_client)
+    coordinator.start_session_janitor()
     
     # Perform health check
     health_status = await coordinator.health_check()
@@ -337,7 +532,7 @@ async def initialize_agent_coordinator(llm: ChatWatsonx) -> AgentCoordinator:
     if health_status["overall_health"] == "healthy":
         logger.info("Agent Coordinator initialized successfully - all agents healthy")
     else:
-        logger.warning(f"Agent Coordinator initialized with issues: {health_status}")
+        logger.warning("Agent Coordinator initialized with issues: %s", health_status)
     
     _agent_coordinator = coordinator
     return coordinator
\ No newline at end of file
@@ -1,23 +1,124 @@
 import asyncio
+import atexit
 import logging
-from typing import Dict, Any
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from string import Template
+from typing import Dict, Any, List, Optional, Tuple
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langchain_ibm import ChatWatsonx  # Adjust import based on your setup
-from .base_agent import AgentContext, BaseAgent  # Adjust import path
+from .base_agent import AgentContext, BaseAgent, _response_text  # Adjust import path
+from .pipeline import PipelineStep, run_dag
 from .utils.financial_ratios import FinancialRatioEngine
+from .utils.retry import retry_async
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('risk_analytics_agent.log')
-    ]
-)
 logger = logging.getLogger(__name__)
 
+_log_listener: Optional[QueueListener] = None
+
+
+def configure_logging(path: Optional[str] = 'risk_analytics_agent.log', level: int = logging.INFO) -> None:
+    """
+    Opt-in logging setup for running the agent standalone.
+
+    Records are put on a queue and written to the console (and ``path``, if
+    given) by a background listener thread, so logging never blocks the
+    event loop on file I/O. Host applications that configure logging
+    themselves should not call this.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers: List[logging.Handler] = [logging.StreamHandler()]
+    if path:
+        handlers.append(logging.FileHandler(path))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level)
+    root_logger.addHandler(QueueHandler(log_queue))
+
 logger.info("RiskAnalyticsAgent module loaded")
 
+# Upper bound on tool calls in flight per agent, keeps parallel pipelines under
+# the provider's rate limit and the HTTP connection pool size
+MAX_CONCURRENT_TOOL_CALLS = 32
+
+
+# Static instructions for the final analysis, sent first as a system message so the
+# shared prefix can be served from the provider's prompt cache
+_ANALYSIS_INSTRUCTIONS = """Provide a comprehensive risk analysis based on the financial profile supplied by the user.
+
+Please provide:
+1. Executive summary of the risk profile
+2. Detailed analysis of each risk component
+3. Key insights and recommendations based on comprehensive financial ratios
+4. Potential risk factors to monitor
+5. Integration of quantitative ratio analysis with qualitative assessment
+
+Format your response professionally with clear sections and actionable insights."""
+_ANALYSIS_SYSTEM_MESSAGE = SystemMessage(content=_ANALYSIS_INSTRUCTIONS)
+
+# Per-user data for the final analysis, compiled once; money fields arrive
+# pre-formatted with thousands separators
+_ANALYSIS_DATA = Template("""FINANCIAL PROFILE:
+- Age: ${age} years
+- Annual Income: $$${income}
+- Net Worth: $$${net_worth}
+- Dependents: ${dependents}
+- Time Horizon: ${time_horizon} years
+- Target Amount: $$${target_amount}
+- Monthly Contribution: $$${monthly_contribution}
+- Risk Tolerance (1-10): ${risk_tolerance}
+
+CALCULATED METRICS:
+- Savings Rate: ${savings_rate}%
+- Liquidity Ratio: ${liquidity_ratio} months
+- Debt-to-Asset Ratio: ${debt_to_asset}%
+- Overall Risk Score: ${risk_score}/100
+
+RISK ASSESSMENT RESULTS:
+- Risk Capacity: ${capacity_level} (${capacity_score}/100)
+- Risk Tolerance: ${tolerance_level} (${tolerance_score}/100)
+- Risk Requirement: ${requirement_level} (${requirement_score}/100)
+
+COMPREHENSIVE RATIO ANALYSIS:
+${ratio_summary}
+""")
+
+
+# Stated risk tolerance labels mapped onto the 1-10 scale
+_RT_MAP = {'low': 3, 'medium': 5, 'moderate': 5, 'high': 8}
+# Defaults for assessment fields that are missing or None
+_DEFAULTS = {'net_worth': 0, 'dependents': 0, 'target_amount': 0, 'monthly_contribution': 0.0}
+
+
+def _safe_int(value: Any, default: int) -> int:
+    """Convert to int, falling back to default for None or unparseable values."""
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _safe_float(value: Any, default: float) -> float:
+    """Convert to float, falling back to default for None or unparseable values."""
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
 
 class RiskAnalyticsAgent(BaseAgent):
     def __init__(self, llm: ChatWatsonx):
@@ -30,7 +131,7 @@ class RiskAnalyticsAgent(BaseAgent):
 
          # Initialize financial ratio engine
         self.ratio_engine = FinancialRatioEngine()
-        self.llm = ChatWatsonx()
+        self._tool_semaphore = asyncio.Semaphore(MAX_CONCURRENT_TOOL_CALLS)
         
 
     async def _execute_agent_logic(self, context: AgentContext) -> Dict[str, Any]:
@@ -48,110 +149,70 @@ class RiskAnalyticsAgent(BaseAgent):
         # Normalize assessment data
         logger.info("Normalizing user assessment data")
         assessment = self._normalize_user_assessment(context.user_assessment)
-        logger.debug("Normalized assessment: %s", assessment)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Normalized assessment: %s", assessment)
 
-        # Step 1: Calculate financial ratios
-        ratio_results = self.ratio_engine.calculate_all_ratios(assessment)
-
-        financial_ratios = self._extract_key_ratios(ratio_results)
-        ratio_summary = self.ratio_engine.generate_ratio_summary(ratio_results)
+        # Step 1: Calculate financial ratios (repeat profiles are served from the engine's cache)
+        ratio_results, financial_ratios, ratio_summary = self._get_ratio_analysis(assessment)
 
 
-        # Step 2: Assess risk components
+        # Steps 2-7: Run the tool calls as a dependency graph so each starts as soon
+        # as its inputs are ready; only volatility (risk score) and the AI analysis
+        # (risk components and score) have to wait on other steps
         logger.info("Starting risk component assessment")
-        
+        # Optional queue receiving analysis text chunks as they are generated,
+        # terminated with None, e.g. to feed a streaming HTTP response
+        chunk_queue: Optional[asyncio.Queue] = (context.metadata or {}).get("analysis_stream")
         try:
-            logger.info("Assessing risk capacity")
-            risk_capacity = await self.llm.invoke_tool(
-                "_assess_risk_capacity", {
+            results = await run_dag([
+                self._tool_step("risk_capacity", "_assess_risk_capacity", {
                     "assessment": assessment,
                     "ratios": financial_ratios,
                     "ratio_results": ratio_results
-                }
-            )
+                }),
+                self._tool_step("risk_tolerance", "_assess_risk_tolerance", {"assessment": assessment}),
+                self._tool_step("risk_requirement", "_assess_risk_requirement", {"assessment": assessment}),
+                self._tool_step("risk_score", "_calculate_enhanced_risk_score", {
+                    "assessment": assessment,
+                    "ratios": financial_ratios,
+                    "ratio_summary": ratio_summary
+                }),
+                PipelineStep(
+                    name="volatility_target",
+                    deps=("risk_score",),
+                    run=lambda risk_score: self._invoke_tool_bounded(
+                        "_map_risk_to_volatility", {"risk_score": risk_score}
+                    )
+                ),
+                self._tool_step("time_horizon_bands", "_analyze_time_horizon_bands", {"assessment": assessment}),
+                self._tool_step("liquidity_constraints", "_assess_liquidity_constraints", {
+                    "assessment": assessment,
+                    "ratios": financial_ratios
+                }),
+                PipelineStep(
+                    name="ai_analysis",
+                    deps=("risk_capacity", "risk_tolerance", "risk_requirement", "risk_score"),
+                    run=lambda **components: self._stream_analysis(self._build_analysis_messages(
+                        assessment, financial_ratios, ratio_summary, **components
+                    ), chunk_queue)
+                )
+            ])
+        finally:
+            if chunk_queue is not None:
+                chunk_queue.put_nowait(None)
+
+        risk_capacity = results["risk_capacity"]
+        risk_tolerance = results["risk_tolerance"]
+        risk_requirement = results["risk_requirement"]
+        risk_score = results["risk_score"]
+        volatility_target = results["volatility_target"]
+        time_horizon_bands = results["time_horizon_bands"]
+        liquidity_constraints = results["liquidity_constraints"]
+        ai_analysis = results["ai_analysis"]
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug("Risk capacity result: %s", risk_capacity)
-            
-            logger.info("Assessing risk tolerance")
-            risk_tolerance = await self.llm.invoke_tool(
-                "_assess_risk_tolerance", {"assessment": assessment}
-            )
             logger.debug("Risk tolerance result: %s", risk_tolerance)
-            
-            logger.info("Assessing risk requirement")
-            risk_requirement = await self.llm.invoke_tool(
-                "_assess_risk_requirement", {"assessment": assessment}
-            )
             logger.debug("Risk requirement result: %s", risk_requirement)
-            
-        except Exception as e:
-            logger.error("Error during risk assessment: %s", str(e))
-            raise
-
-        # Step 3: Calculate enhanced risk score
-        risk_score = await self.llm.invoke_tool(
-            "_calculate_enhanced_risk_score", {
-                "assessment": assessment,
-                "ratios": financial_ratios,
-                "ratio_summary": ratio_summary
-            }
-        )
-
-        # Step 4: Map to volatility target
-        volatility_target = await self.llm.invoke_tool(
-            "_map_risk_to_volatility", {"risk_score": risk_score}
-        )
-
-        # Step 5: Analyze time horizon bands
-        time_horizon_bands = await self.llm.invoke_tool(
-            "_analyze_time_horizon_bands", {"assessment": assessment}
-        )
-
-        # Step 6: Assess liquidity constraints
-        liquidity_constraints = await self.llm.invoke_tool(
-            "_assess_liquidity_constraints", {
-                "assessment": assessment,
-                "ratios": financial_ratios
-            }
-        )
-
-        # Step 7: Generate AI-powered analysis
-        analysis_prompt = f"""
-Provide a comprehensive risk analysis based on the following financial profile:
-
-FINANCIAL PROFILE:
-- Age: {assessment.get('age')} years
-- Annual Income: ${assessment.get('income', 0):,}
-- Net Worth: ${assessment.get('net_worth', 0):,}
-- Dependents: {assessment.get('dependents', 0)}
-- Time Horizon: {assessment.get('time_horizon')} years
-- Target Amount: ${assessment.get('target_amount', 0):,}
-- Monthly Contribution: ${assessment.get('monthly_contribution', 0):,}
-- Risk Tolerance (1-10): {assessment.get('risk_tolerance')}
-
-CALCULATED METRICS:
-- Savings Rate: {financial_ratios.get('savings_rate', 0):.1f}%
-- Liquidity Ratio: {financial_ratios.get('liquidity_ratio', 0):.1f} months
-- Debt-to-Asset Ratio: {financial_ratios.get('debt_to_asset', 0):.1f}%
-- Overall Risk Score: {risk_score}/100
-
-RISK ASSESSMENT RESULTS:
-- Risk Capacity: {risk_capacity['level']} ({risk_capacity['score']}/100)
-- Risk Tolerance: {risk_tolerance['level']} ({risk_tolerance['score']}/100)  
-- Risk Requirement: {risk_requirement['level']} ({risk_requirement['score']}/100)
-
-COMPREHENSIVE RATIO ANALYSIS:
-{ratio_summary if ratio_summary else 'Standard ratio analysis applied'}
-
-Please provide:
-1. Executive summary of the risk profile
-2. Detailed analysis of each risk component
-3. Key insights and recommendations based on comprehensive financial ratios
-4. Potential risk factors to monitor
-5. Integration of quantitative ratio analysis with qualitative assessment
-
-Format your response professionally with clear sections and actionable insights.
-"""
-        ai_analysis = await self.llm.invoke(analysis_prompt)
 
         # Step 8: Create structured risk blueprint (simplified, assuming LLM can't call _create_risk_blueprint directly)
         risk_blueprint = {
@@ -191,6 +252,65 @@ Format your response professionally with clear sections and actionable insights.
 
         }
 
+    def _get_ratio_analysis(self, assessment: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, float], Dict[str, Any]]:
+        """Return ratio results, key ratios and summary; each call gets its own objects."""
+        ratio_results = self.ratio_engine.calculate_all_ratios(assessment)
+        financial_ratios = self._extract_key_ratios(ratio_results)
+        ratio_summary = self.ratio_engine.generate_ratio_summary(ratio_results)
+
+        return ratio_results, financial_ratios, ratio_summary
+
+    def _tool_step(self, name: str, tool_name: str, tool_args: Dict[str, Any]) -> PipelineStep:
+        """Create a pipeline step that invokes a deployed LLM tool with fixed arguments."""
+        return PipelineStep(name=name, run=lambda: self._invoke_tool_bounded(tool_name, tool_args))
+
+    async def _invoke_tool_bounded(self, tool_name: str, tool_args: Dict[str, Any]) -> Any:
+        """Invoke an LLM tool under the concurrency limit, retrying transient failures."""
+        async with self._tool_semaphore:
+            return await retry_async(
+                lambda: self.llm.invoke_tool(tool_name, tool_args),
+                retries=3, base_delay=0.25, jitter=True
+            )
+
+    async def _stream_analysis(self, messages: List[BaseMessage],
+                               chunk_queue: Optional[asyncio.Queue] = None) -> str:
+        """Generate the analysis with astream, forwarding chunks to chunk_queue as they arrive."""
+        parts: List[str] = []
+        async for chunk in self.llm.astream(messages):
+            text = _response_text(chunk)
+            parts.append(text)
+            if chunk_queue is not None:
+                chunk_queue.put_nowait(text)
+        return "".join(parts)
+
+    def _build_analysis_messages(self, assessment: Dict[str, Any], financial_ratios: Dict[str, float],
+                                 ratio_summary: Dict[str, Any], risk_capacity: Dict[str, Any],
+                                 risk_tolerance: Dict[str, Any], risk_requirement: Dict[str, Any],
+                                 risk_score: Any) -> List[BaseMessage]:
+        """Build the messages for the final AI-powered risk analysis: static instructions, then user data."""
+        data = _ANALYSIS_DATA.substitute(
+            age=assessment.get('age'),
+            income=f"{assessment.get('income', 0):,}",
+            net_worth=f"{assessment.get('net_worth', 0):,}",
+            dependents=assessment.get('dependents', 0),
+            time_horizon=assessment.get('time_horizon'),
+            target_amount=f"{assessment.get('target_amount', 0):,}",
+            monthly_contribution=f"{assessment.get('monthly_contribution', 0):,}",
+            risk_tolerance=assessment.get('risk_tolerance'),
+            savings_rate=f"{financial_ratios.get('savings_rate', 0):.1f}",
+            liquidity_ratio=f"{financial_ratios.get('liquidity_ratio', 0):.1f}",
+            debt_to_asset=f"{financial_ratios.get('debt_to_asset', 0):.1f}",
+            risk_score=risk_score,
+            capacity_level=risk_capacity['level'],
+            capacity_score=risk_capacity['score'],
+            tolerance_level=risk_tolerance['level'],
+            tolerance_score=risk_tolerance['score'],
+            requirement_level=risk_requirement['level'],
+            requirement_score=risk_requirement['score'],
+            ratio_summary=ratio_summary if ratio_summary else 'Standard ratio analysis applied'
+        )
+        return [_ANALYSIS_SYSTEM_MESSAGE, HumanMessage(content=data)]
+
     def _extract_key_ratios(self, ratio_results: Dict[str, Any]) -> Dict[str, float]:
         """Extract key ratio values for backward compatibility."""
         key_ratios = {}
@@ -262,35 +382,18 @@ Format your response professionally with clear sections and actionable insights.
     def _normalize_user_assessment(self, raw: Dict[str, Any]) -> Dict[str, Any]:
         """Normalize various UserProfile shapes into the fields this agent expects."""
         normalized = dict(raw or {})
-        if 'monthly_contribution' not in normalized:
-            if 'savings_rate' in normalized:
-                try:
-                    normalized['monthly_contribution'] = float(normalized.get('savings_rate') or 0)
-                except Exception:
-                    normalized['monthly_contribution'] = 0.0
-            else:
-                normalized['monthly_contribution'] = 0.0
-        normalized['income'] = float(normalized.get('income') or 0)
-        if 'net_worth' not in normalized or normalized['net_worth'] is None:
-            normalized['net_worth'] = 0
-        if 'dependents' not in normalized or normalized['dependents'] is None:
-            normalized['dependents'] = 0
-        if 'target_amount' not in normalized or normalized['target_amount'] is None:
-            normalized['target_amount'] = 0
+        if 'monthly_contribution' not in normalized and 'savings_rate' in normalized:
+            normalized['monthly_contribution'] = _safe_float(normalized['savings_rate'], 0.0)
+        for field, default in _DEFAULTS.items():
+            if normalized.get(field) is None:
+                normalized[field] = default
+        normalized['income'] = _safe_float(normalized.get('income'), 0.0)
         rt = normalized.get('risk_tolerance')
         if isinstance(rt, str):
-            mapping = {'low': 3, 'medium': 5, 'moderate': 5, 'high': 8}
-            normalized['risk_tolerance'] = mapping.get(rt.strip().lower(), 5)
-        elif isinstance(rt, (int, float)):
-            normalized['risk_tolerance'] = int(rt)
+            normalized['risk_tolerance'] = _RT_MAP.get(rt.strip().lower(), 5)
         else:
-            normalized['risk_tolerance'] = 5
-        try:
-            normalized['time_horizon'] = int(normalized.get('time_horizon') or 10)
-        except Exception:
-            normalized['time_horizon'] = 10
-        try:
-            normalized['age'] = int(normalized.get('age') or 35)
-        except Exception:
-            normalized['age'] = 35
-        return normalized
\ No newline at end of file
+            normalized['risk_tolerance'] = _safe_int(rt, 5)
+        # An age or time horizon of 0 is not meaningful, so it falls back too
+        normalized['time_horizon'] = _safe_int(normalized.get('time_horizon'), 10) or 10
+        normalized['age'] = _safe_int(normalized.get('age'), 35) or 35
+        return normalized
@@ -3,19 +3,103 @@ Base agent class for the PortfolioAI multi-agent system.
 Provides common functionality for all specialized agents.
 """
 
+import asyncio
+import copy
+import hashlib
+import inspect
+import io
 import logging
+import os
+import random
+import sys
 import time
+import weakref
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from collections import ChainMap, Counter, OrderedDict, deque
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Any, AsyncIterator, Callable, Deque, Optional, List, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
-from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
-from langchain_ibm import ChatWatsonx
+import numpy as np
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, AIMessage
+
+if TYPE_CHECKING:
+    from langchain_ibm import ChatWatsonx
+
+from .response_cache import ResponseCache, dumps_for_key, get_response_cache, llm_cache_scope, message_cache_key
+from .utils.retry import is_transient_error
 
 
 logger = logging.getLogger(__name__)
 
+# Prompts arriving within this window are sent to the LLM as one batch
+BATCH_MAX_WAIT_MS = 20
+BATCH_MAX_SIZE = 16
+
+# Slotted dataclasses need Python 3.10+
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Context schema checked by _validate_input: (field, required type, result when
+# the field is missing or empty). Results are shared, read-only dictionaries.
+_CONTEXT_SCHEMA = (
+    ("session_id", str, {"valid": False, "error": "Missing session_id"}),
+    ("user_assessment", Mapping, {"valid": False, "error": "Missing user_assessment"}),
+)
+_VALID_INPUT = {"valid": True}
+
+# Role names recorded in the conversation history
+_ROLE_MAP = {SystemMessage: "system", HumanMessage: "user", AIMessage: "assistant"}
+
+# Message text kept per conversation history entry; long system prompts would
+# otherwise be retained in full by every entry
+_MAX_LOG_CHARS = 512
+_MAX_LOG_RESPONSE_CHARS = 200
+
+
+def _response_text(response: Any) -> Any:
+    """Content of an LLM response or stream chunk"""
+    # Explicit types rather than hasattr, so a failing .content property is not masked
+    if isinstance(response, BaseMessage):
+        return response.content
+    if isinstance(response, str):
+        return response
+    return str(response)
+
+
+def _truncate(text: Any, limit: int) -> str:
+    text = text if isinstance(text, str) else str(text)
+    return text[:limit] + "..." if len(text) > limit else text
+
+# Processed results kept per agent for repeated assessments
+RESULT_CACHE_SIZE = 128
+
+# User profile section of the LLM context, filled from the assessment
+_CTX_TPL = (
+    "USER PROFILE:\n"
+    "- Age: {age}\n"
+    "- Income: ${income:,}\n"
+    "- Net Worth: ${net_worth:,}\n"
+    "- Risk Tolerance: {risk_tolerance}/10\n"
+    "- Time Horizon: {time_horizon} years"
+)
+_CTX_DEFAULTS = {"age": "N/A", "income": 0, "net_worth": 0, "risk_tolerance": "N/A", "time_horizon": "N/A"}
+
+# Concurrent requests per LLM batch, and dedicated threads for LLMs that only
+# offer a blocking batch call, so they never queue behind other work on the
+# default executor. The threads are only started when such an LLM is used.
+LLM_CONCURRENCY = int(os.getenv("AGENT_LLM_CONCURRENCY", "16"))
+_llm_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_llm_executor() -> ThreadPoolExecutor:
+    """Executor for blocking LLM batch calls, created on first use"""
+    global _llm_executor
+    if _llm_executor is None:
+        _llm_executor = ThreadPoolExecutor(max_workers=LLM_CONCURRENCY, thread_name_prefix="llm")
+    return _llm_executor
+
 
 class AgentStatus(Enum):
     """Agent status enumeration"""
@@ -25,9 +109,9 @@ class AgentStatus(Enum):
     ERROR = "error"
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class AgentContext:
-    """Context object passed between agents"""
+    """Context object passed between agents; use dataclasses.replace to derive updated contexts"""
     session_id: str
     user_assessment: Dict[str, Any]
     market_conditions: Optional[Dict[str, Any]] = None
@@ -37,7 +121,7 @@ class AgentContext:
     metadata: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class AgentResponse:
     """Standardized agent response"""
     agent_name: str
@@ -50,17 +134,143 @@ class AgentResponse:
     status: AgentStatus = AgentStatus.COMPLETED
 
 
+class AsyncBatcher:
+    """
+    Coalesces concurrent LLM calls into batched requests.
+
+    Items submitted within ``max_wait_ms`` of each other (or until
+    ``max_batch`` are pending) are passed together to ``batch_fn``, which must
+    return one result or exception per item. A coroutine function is awaited
+    on the event loop; a plain function runs in ``executor``.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], Any],
+                 max_batch: int = BATCH_MAX_SIZE, max_wait_ms: float = BATCH_MAX_WAIT_MS,
+                 executor: Optional[ThreadPoolExecutor] = None):
+        self.batch_fn = batch_fn
+        self.executor = executor
+        self._is_async = inspect.iscoroutinefunction(batch_fn)
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def submit(self, item: Any) -> Any:
+        """Queue an item for the next batch and wait for its result."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Pending items of a previous event loop can never be delivered
+            self._loop = loop
+            self._pending = []
+            self._flush_handle = None
+
+        future = loop.create_future()
+        # No await between appending and flushing, so the event loop needs no lock here
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            self._loop.create_task(self._run_batch(batch))
+
+    async def _run_batch(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        logger.debug("Submitting LLM batch of %s request(s)", len(batch))
+        items = [item for item, _ in batch]
+        try:
+            if self._is_async:
+                results = await self.batch_fn(items)
+            else:
+                results = await asyncio.get_running_loop().run_in_executor(self.executor, self.batch_fn, items)
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+# One batcher per LLM client, shared by every agent using it. Keyed by id as
+# LangChain models are unhashable; entries are dropped when the LLM is collected.
+_batchers: Dict[int, AsyncBatcher] = {}
+
+
+def _weak_batch_fn(llm: "ChatWatsonx") -> Callable[[List[Any]], Any]:
+    """
+    Batch function calling llm.abatch, or llm.batch, through a weak reference
+    so the shared batcher does not keep the LLM alive.
+    """
+    llm_ref = weakref.ref(llm)
+    kwargs = {"config": {"max_concurrency": LLM_CONCURRENCY}, "return_exceptions": True}
+    if hasattr(llm, "abatch"):
+        async def batch_fn(items: List[Any]) -> Any:
+            return await llm_ref().abatch(items, **kwargs)
+    else:
+        def batch_fn(items: List[Any]) -> Any:
+            return llm_ref().batch(items, **kwargs)
+    return batch_fn
+
+
+def get_llm_batcher(llm: "ChatWatsonx") -> AsyncBatcher:
+    """
+    Get the shared batcher for an LLM client.
+
+    Uses llm.abatch when available so requests go through the LLM's async
+    HTTP client (shared across agents by the coordinator) without holding
+    threads; otherwise llm.batch runs on the LLM executor.
+    """
+    key = id(llm)
+    batcher = _batchers.get(key)
+    if batcher is None:
+        executor = None if hasattr(llm, "abatch") else _get_llm_executor()
+        batcher = AsyncBatcher(_weak_batch_fn(llm), executor=executor)
+        _batchers[key] = batcher
+        weakref.finalize(llm, _batchers.pop, key, None)
+    return batcher
+
+
 class BaseAgent(ABC):
     """
     Abstract base class for all PortfolioAI agents.
     Provides common functionality and interface for specialized agents.
     """
     
+    # Provider prompt-cache hint attached to the system message, e.g.
+    # {"type": "ephemeral"} for providers that honour cache_control; WatsonX does not
+    prompt_cache_control: Optional[Dict[str, Any]] = None
+    
+    # Calls are batched with concurrent calls to the same LLM; set to stream
+    # responses with llm.astream instead, when the LLM supports it
+    stream_llm_responses: bool = False
+    # Stop reading a streamed response once it ends with this text (e.g. "}\n")
+    stream_stop: Optional[str] = None
+    
+    # Keep conversation_history even when debug logging is off
+    record_conversations: bool = False
+    
+    # Serve repeated requests from the result cache; agents whose results depend
+    # on anything beyond the context sections in _result_cache_key opt out
+    cache_results: bool = True
+    
     def __init__(self, 
                  name: str,
-                 llm: ChatWatsonx,
+                 llm: "ChatWatsonx",
                  system_prompt: str,
-                 max_retries: int = 2):
+                 max_retries: int = 2,
+                 response_cache: Optional[ResponseCache] = None,
+                 semantic_cache: bool = False):
         """
         Initialize base agent.
         
@@ -69,18 +279,37 @@ class BaseAgent(ABC):
             llm: ChatWatsonx instance for AI processing
             system_prompt: System prompt defining agent behavior
             max_retries: Maximum retry attempts for failed operations
+            response_cache: Cache for LLM responses (defaults to the shared cache)
+            semantic_cache: Also reuse responses of near-duplicate prompts;
+                leave off for agents whose prompts must match exactly
         """
         self.name = name
         self.llm = llm
         self.system_prompt = system_prompt
+        # The static prefix never changes, so its message is built once on first use
+        self._system_message: Optional[SystemMessage] = None
         self.max_retries = max_retries
+        self.response_cache = response_cache or get_response_cache()
+        self.semantic_cache = semantic_cache
+        # Cached responses are only shared by the same agent, model and generation parameters
+        self._cache_scope = llm_cache_scope(llm, name)
+        self._batcher = get_llm_batcher(llm)
         
         # Agent state
         self.status = AgentStatus.IDLE
-        self.conversation_history: List[Dict[str, Any]] = []
+        # Only the last 10 conversations are kept to prevent memory issues
+        self.conversation_history: Deque[Dict[str, Any]] = deque(maxlen=10)
+        self._last_activity: Optional[float] = None
+        
+        # Request counters and recent successful latencies for get_status
+        self._metrics: Counter = Counter()
+        self._latencies: Deque[float] = deque(maxlen=1024)
+        
+        # Post-processed results keyed by _result_cache_key
+        self._result_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self.context: Optional[AgentContext] = None
         
-        logger.info(f"Initialized {self.name} agent")
+        logger.info("Initialized %s agent", self.name)
     
     async def process(self, context: AgentContext) -> AgentResponse:
         """
@@ -92,12 +321,32 @@ class BaseAgent(ABC):
         Returns:
             AgentResponse with processing results
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
+        
+        # A repeated request skips validation, agent logic and post-processing
+        cache_key = self._result_cache_key(context)
+        cached = self._result_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            self._result_cache.move_to_end(cache_key)
+            self._metrics["cache_hits"] += 1
+            self.context = context
+            self.status = AgentStatus.COMPLETED
+            return AgentResponse(
+                agent_name=self.name,
+                success=True,
+                content=cached.get("content", ""),
+                # Callers own their structured data, so each hit gets its own copy
+                structured_data=copy.deepcopy(cached.get("structured_data")),
+                processing_time=time.perf_counter() - start_time,
+                confidence=cached.get("confidence", 1.0),
+                status=AgentStatus.COMPLETED
+            )
+        
         self.status = AgentStatus.PROCESSING
         self.context = context
         
         try:
-            logger.info(f"{self.name} agent starting processing for session {context.session_id}")
+            logger.info("%s agent starting processing for session %s", self.name, context.session_id)
             
             # Validate input
             validation_result = self._validate_input(context)
@@ -109,9 +358,15 @@ class BaseAgent(ABC):
             
             # Post-process results
             processed_result = self._post_process_results(result, context)
+            if cache_key:
+                self._result_cache[cache_key] = copy.deepcopy(processed_result)
+                if len(self._result_cache) > RESULT_CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
             
             self.status = AgentStatus.COMPLETED
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
+            self._metrics["completed"] += 1
+            self._latencies.append(processing_time)
             
             response = AgentResponse(
                 agent_name=self.name,
@@ -123,15 +378,16 @@ class BaseAgent(ABC):
                 status=AgentStatus.COMPLETED
             )
             
-            logger.info(f"{self.name} agent completed processing in {processing_time:.2f}s")
+            logger.info("%s agent completed processing in %.2fs", self.name, processing_time)
             return response
             
         except Exception as e:
             self.status = AgentStatus.ERROR
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
+            self._metrics["failed"] += 1
             error_msg = str(e)
             
-            logger.error(f"{self.name} agent failed: {error_msg}")
+            logger.error("%s agent failed: %s", self.name, error_msg)
             
             return AgentResponse(
                 agent_name=self.name,
@@ -142,6 +398,52 @@ class BaseAgent(ABC):
                 status=AgentStatus.ERROR
             )
     
+    @classmethod
+    async def run_many(cls, agents_ctx: List[Tuple["BaseAgent", AgentContext]]) -> List[AgentResponse]:
+        """
+        Run independent agents concurrently; their LLM calls share the LLM batcher.
+        
+        Args:
+            agents_ctx: (agent, context) pairs to process
+            
+        Returns:
+            AgentResponse per pair, in order; unexpected errors become failed responses
+        """
+        results = await asyncio.gather(*(agent.process(context) for agent, context in agents_ctx),
+                                       return_exceptions=True)
+        responses = []
+        for (agent, _), result in zip(agents_ctx, results):
+            if isinstance(result, Exception):
+                logger.error("%s agent failed: %s", agent.name, result)
+                result = AgentResponse(
+                    agent_name=agent.name,
+                    success=False,
+                    content="",
+                    error=str(result),
+                    status=AgentStatus.ERROR
+                )
+            elif isinstance(result, BaseException):
+                raise result
+            responses.append(result)
+        return responses
+    
+    def _result_cache_key(self, context: AgentContext) -> Optional[str]:
+        """
+        Key of a request's result: agent and context sections; None when the
+        result must not be cached or the context is not serializable
+        """
+        # Metadata carries per-request handles (e.g. stream queues) that only
+        # running the agent logic serves, so those requests are never cached
+        if not self.cache_results or context.metadata:
+            return None
+        # Session ids are unique per workflow, so they are left out for repeated requests to hit
+        try:
+            payload = dumps_for_key([self.name, context.user_assessment, context.market_conditions,
+                                     context.risk_profile, context.portfolio_data])
+        except (TypeError, ValueError):
+            return None
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
     @abstractmethod
     async def _execute_agent_logic(self, context: AgentContext) -> Dict[str, Any]:
         """
@@ -165,13 +467,14 @@ class BaseAgent(ABC):
         Returns:
             Dictionary with validation results
         """
-        if not context.session_id:
-            return {"valid": False, "error": "Missing session_id"}
-        
-        if not context.user_assessment:
-            return {"valid": False, "error": "Missing user_assessment"}
+        for field_name, field_type, missing in _CONTEXT_SCHEMA:
+            value = getattr(context, field_name)
+            if not value:
+                return missing
+            if not isinstance(value, field_type):
+                return {"valid": False, "error": f"{field_name} must be a {field_type.__name__}"}
         
-        return {"valid": True}
+        return _VALID_INPUT
     
     def _post_process_results(self, 
                             result: Dict[str, Any], 
@@ -202,62 +505,127 @@ class BaseAgent(ABC):
             LLM response content
             
         Raises:
-            Exception: If all retry attempts fail
+            Exception: If all retry attempts fail or the error is not transient
         """
         retries = max_retries or self.max_retries
         last_error = None
         
+        # Identical prompts are answered from the cache without a round-trip
+        cache_key = message_cache_key(messages, self._cache_scope)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("%s LLM response served from cache", self.name)
+            return cached
+        
+        embedding = None
+        semantic_scope = ""
+        if self.semantic_cache and self.response_cache.semantic_available:
+            # Near-duplicates only match within the same agent, model and system prompt
+            system = [msg for msg in messages if isinstance(msg, SystemMessage)]
+            semantic_scope = message_cache_key(system, self._cache_scope)
+            prompt = "\n".join(str(msg.content) for msg in messages if not isinstance(msg, SystemMessage))
+            embedding = await asyncio.to_thread(self.response_cache.embed, prompt)
+            cached = self.response_cache.get_similar(embedding, semantic_scope)
+            if cached is not None:
+                logger.debug("%s LLM response served from semantic cache", self.name)
+                return cached
+        self.response_cache.record_miss()
+        
         for attempt in range(retries + 1):
             try:
-                logger.debug(f"{self.name} LLM call attempt {attempt + 1}/{retries + 1}")
+                logger.debug("%s LLM call attempt %s/%s", self.name, attempt + 1, retries + 1)
                 
-                response = await self._invoke_llm_async(messages)
-                content = response.content if hasattr(response, 'content') else str(response)
+                content = await self._generate(messages)
                 
                 # Log conversation for debugging
                 self._log_conversation(messages, content)
+                self.response_cache.set(cache_key, content, embedding, semantic_scope)
                 
                 return content
                 
             except Exception as e:
                 last_error = str(e)
-                logger.warning(f"{self.name} LLM call failed on attempt {attempt + 1}: {last_error}")
+                logger.warning("%s LLM call failed on attempt %s: %s", self.name, attempt + 1, last_error)
+                
+                # Bad requests fail the same way every time, so only transient errors are retried
+                if not is_transient_error(e):
+                    raise Exception(f"LLM call failed with a non-retryable error: {last_error}") from e
                 
                 if attempt < retries:
                     await self._wait_before_retry(attempt)
         
         raise Exception(f"LLM call failed after {retries + 1} attempts. Last error: {last_error}")
     
+    async def _generate(self, messages: List[Any]) -> str:
+        """Generate the response text, streaming it when the LLM supports it"""
+        if not (self.stream_llm_responses and hasattr(self.llm, "astream")):
+            response = await self._invoke_llm_async(messages)
+            return _response_text(response)
+        
+        buffer = io.StringIO()
+        tail = ""
+        stream = self._astream_llm(messages)
+        try:
+            async for text in stream:
+                buffer.write(text)
+                if self.stream_stop:
+                    tail = (tail + text)[-len(self.stream_stop):]
+                    if tail == self.stream_stop:
+                        break
+        finally:
+            await stream.aclose()
+        return buffer.getvalue()
+    
+    async def _astream_llm(self, messages: List[Any]) -> AsyncIterator[str]:
+        """Yield response text chunks as the LLM generates them"""
+        async for chunk in self.llm.astream(messages):
+            yield _response_text(chunk)
+    
     async def _invoke_llm_async(self, messages: List[Any]) -> Any:
-        """Async wrapper for LLM invocation"""
-        import asyncio
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.llm.invoke, messages)
+        """Async LLM invocation, batched with concurrent calls to the same LLM"""
+        return await self._batcher.submit(messages)
     
     async def _wait_before_retry(self, attempt: int) -> None:
-        """Wait before retry with exponential backoff"""
-        import asyncio
-        wait_time = min(2 ** attempt, 10)  # Cap at 10 seconds
+        """Wait before retry with exponential backoff and full jitter"""
+        # Random waits keep concurrent agents from retrying in lockstep; cap at 10 seconds
+        wait_time = random.uniform(0, min(0.5 * 2 ** attempt, 10))
         await asyncio.sleep(wait_time)
     
     def _log_conversation(self, messages: List[Any], response: str) -> None:
         """Log conversation for debugging and monitoring"""
+        self._last_activity = time.time()
+        # Building the entry copies every message, so only do it when someone will read it
+        if not (self.record_conversations or logger.isEnabledFor(logging.DEBUG)):
+            return
+        
         conversation_entry = {
-            "timestamp": time.time(),
+            "timestamp": self._last_activity,
             "agent": self.name,
-            "messages": [{"role": msg.__class__.__name__, "content": str(msg.content)} for msg in messages],
-            "response": response[:200] + "..." if len(response) > 200 else response
+            "messages": [
+                {"role": _ROLE_MAP.get(type(msg), "other"), "content": _truncate(msg.content, _MAX_LOG_CHARS)}
+                for msg in messages
+            ],
+            "response": _truncate(response, _MAX_LOG_RESPONSE_CHARS)
         }
         self.conversation_history.append(conversation_entry)
-        
-        # Keep only last 10 conversations to prevent memory issues
-        if len(self.conversation_history) > 10:
-            self.conversation_history = self.conversation_history[-10:]
+    
+    def _build_static_prefix(self) -> str:
+        """
+        Text of the system message. Override to add few-shot examples or
+        output schemas; everything here must be identical across calls.
+        """
+        return self.system_prompt
     
     def _create_messages(self, user_prompt: str, include_context: bool = True) -> List[Any]:
         """
         Create message list for LLM with system prompt and user input.
         
+        Messages are ordered static-first so provider-side prefix caches can
+        reuse the longest possible prefix: the system message from
+        _build_static_prefix(), then the prompt, then the per-session context
+        last. Subclasses should put fixed instructions in
+        _build_static_prefix() rather than in the prompt or context.
+        
         Args:
             user_prompt: User/agent prompt
             include_context: Whether to include context information
@@ -265,15 +633,21 @@ class BaseAgent(ABC):
         Returns:
             List of messages for LLM
         """
-        messages = [SystemMessage(content=self.system_prompt)]
+        if self._system_message is None:
+            additional_kwargs = {}
+            if self.prompt_cache_control:
+                additional_kwargs["cache_control"] = self.prompt_cache_control
+            self._system_message = SystemMessage(content=self._build_static_prefix(),
+                                                 additional_kwargs=additional_kwargs)
         
-        # Add context information if available and requested
+        messages = [self._system_message, HumanMessage(content=user_prompt)]
+        
+        # Volatile context goes last so it does not break the cached prefix
         if include_context and self.context:
             context_info = self._format_context_for_llm(self.context)
             if context_info:
-                messages.append(HumanMessage(content=f"CONTEXT:\n{context_info}\n\n"))
+                messages.append(HumanMessage(content=f"CONTEXT:\n{context_info}"))
         
-        messages.append(HumanMessage(content=user_prompt))
         return messages
     
     def _format_context_for_llm(self, context: AgentContext) -> str:
@@ -286,37 +660,37 @@ class BaseAgent(ABC):
         Returns:
             Formatted context string
         """
-        context_parts = []
+        sections = []
         
         if context.user_assessment:
-            assessment = context.user_assessment
-            context_parts.append(f"USER PROFILE:")
-            context_parts.append(f"- Age: {assessment.get('age', 'N/A')}")
-            context_parts.append(f"- Income: ${assessment.get('income', 0):,}")
-            context_parts.append(f"- Net Worth: ${assessment.get('net_worth', 0):,}")
-            context_parts.append(f"- Risk Tolerance: {assessment.get('risk_tolerance', 'N/A')}/10")
-            context_parts.append(f"- Time Horizon: {assessment.get('time_horizon', 'N/A')} years")
+            sections.append(_CTX_TPL.format_map(ChainMap(context.user_assessment, _CTX_DEFAULTS)))
         
         if context.market_conditions:
-            context_parts.append(f"\nMARKET CONDITIONS:")
-            for key, value in context.market_conditions.items():
-                context_parts.append(f"- {key}: {value}")
+            sections.append("\nMARKET CONDITIONS:\n" + "\n".join(
+                f"- {key}: {value}" for key, value in context.market_conditions.items()))
         
         if context.risk_profile:
-            context_parts.append(f"\nRISK PROFILE:")
-            for key, value in context.risk_profile.items():
-                context_parts.append(f"- {key}: {value}")
+            sections.append("\nRISK PROFILE:\n" + "\n".join(
+                f"- {key}: {value}" for key, value in context.risk_profile.items()))
         
-        return "\n".join(context_parts)
+        return "\n".join(sections)
     
     def get_status(self) -> Dict[str, Any]:
         """Get current agent status and metrics"""
+        latency_p50 = latency_p99 = None
+        if self._latencies:
+            latency_p50, latency_p99 = (float(p) for p in np.percentile(self._latencies, [50, 99]))
+        
         return {
             "name": self.name,
             "status": self.status.value,
             "conversation_history_length": len(self.conversation_history),
             "has_context": self.context is not None,
-            "last_activity": self.conversation_history[-1]["timestamp"] if self.conversation_history else None
+            "last_activity": self._last_activity,
+            "requests_completed": self._metrics["completed"],
+            "requests_failed": self._metrics["failed"],
+            "latency_p50": latency_p50,
+            "latency_p99": latency_p99
         }
     
     def reset(self) -> None:
@@ -324,4 +698,6 @@ class BaseAgent(ABC):
         self.status = AgentStatus.IDLE
         self.context = None
         self.conversation_history.clear()
-        logger.info(f"{self.name} agent reset")
\ No newline at end of file
+        self._last_activity = None
+        self._result_cache.clear()
+        logger.info("%s agent reset", self.name)
\ No newline at end of file
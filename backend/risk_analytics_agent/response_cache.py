@@ -0,0 +1,209 @@
+"""
+LLM response cache shared by PortfolioAI agents.
+Exact hits are looked up by a hash of the message list; an optional semantic
+layer returns the cached response of a near-duplicate prompt when an
+embedding model is installed.
+"""
+
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def dumps_for_key(value: Any) -> bytes:
+    """
+    Serialize a value for hashing into a cache key: sorted keys, unknown types
+    as str. Uses orjson when installed; keys are only compared within a process.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, sort_keys=True, default=str).encode()
+
+
+def llm_cache_scope(llm: Any, agent_name: str) -> str:
+    """
+    Scope of an agent's cached responses: the agent name plus the LLM's model
+    and generation parameters, so agents and model settings never share entries.
+    """
+    try:
+        # LangChain models report their model id and generation parameters here
+        identity = llm._identifying_params
+    except AttributeError:
+        identity = {"model_id": getattr(llm, "model_id", None), "params": getattr(llm, "params", None)}
+    payload = dumps_for_key([agent_name, type(llm).__name__, identity])
+    return hashlib.sha256(payload).hexdigest()
+
+
+def message_cache_key(messages: List[Any], scope: str = "") -> str:
+    """SHA-256 of the cache scope and the message roles and contents."""
+    payload = dumps_for_key([scope, [(type(msg).__name__, str(msg.content)) for msg in messages]])
+    return hashlib.sha256(payload).hexdigest()
+
+
+class _SemanticIndex:
+    """Normalized prompt embeddings and their responses for one cache scope."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.index = None
+        self.embeddings: Optional[np.ndarray] = None
+        self.responses: List[str] = []
+
+    def search(self, embedding: np.ndarray) -> Tuple[int, float]:
+        """Position and similarity of the most similar stored embedding."""
+        if FAISS_AVAILABLE:
+            scores, ids = self.index.search(embedding.reshape(1, -1), 1)
+            return int(ids[0][0]), float(scores[0][0])
+        similarities = self.embeddings @ embedding
+        best = int(similarities.argmax())
+        return best, float(similarities[best])
+
+    def add(self, embedding: np.ndarray, content: str) -> None:
+        vector = embedding.reshape(1, -1).astype(np.float32)
+
+        if FAISS_AVAILABLE:
+            if self.index is None:
+                self.index = faiss.IndexFlatIP(vector.shape[1])
+            self.index.add(vector)
+            if self.index.ntotal > self.max_entries:
+                # Flat index ids are positions, so removing the oldest keeps them aligned
+                self.index.remove_ids(np.array([0], dtype=np.int64))
+        else:
+            if self.embeddings is None:
+                self.embeddings = vector
+            else:
+                self.embeddings = np.vstack([self.embeddings, vector])[-self.max_entries:]
+
+        self.responses.append(content)
+        if len(self.responses) > self.max_entries:
+            self.responses.pop(0)
+
+
+class ResponseCache:
+    """
+    Two-tier LLM response cache.
+
+    The exact tier is an LRU dictionary keyed by ``message_cache_key``. The
+    semantic tier stores normalized prompt embeddings per scope (agent and
+    system prompt) and matches by cosine similarity (inner product), using a
+    FAISS flat index when available and NumPy otherwise.
+    """
+
+    def __init__(self, max_entries: int = 1024, similarity_threshold: float = 0.95,
+                 embedding_model: str = DEFAULT_EMBEDDING_MODEL):
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.embedding_model = embedding_model
+        self._exact: "OrderedDict[str, str]" = OrderedDict()
+        self._encoder = None
+        self._semantic: Dict[str, _SemanticIndex] = {}
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @property
+    def semantic_available(self) -> bool:
+        """Whether near-duplicate lookups can be served."""
+        return SENTENCE_TRANSFORMERS_AVAILABLE
+
+    def get(self, key: str) -> Optional[str]:
+        """Exact-match lookup."""
+        content = self._exact.get(key)
+        if content is None:
+            return None
+        self._exact.move_to_end(key)
+        self.hits += 1
+        return content
+
+    def set(self, key: str, content: str, embedding: Optional[np.ndarray] = None,
+            semantic_scope: str = "") -> None:
+        """Store a response, and its prompt embedding for semantic lookups in a scope if given."""
+        self._exact[key] = content
+        self._exact.move_to_end(key)
+        if len(self._exact) > self.max_entries:
+            self._exact.popitem(last=False)
+
+        if embedding is not None:
+            index = self._semantic.get(semantic_scope)
+            if index is None:
+                index = self._semantic[semantic_scope] = _SemanticIndex(self.max_entries)
+            index.add(embedding, content)
+
+    def embed(self, text: str) -> Optional[np.ndarray]:
+        """Normalized embedding of text, or None without an embedding model (blocking)."""
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            return None
+        if self._encoder is None:
+            logger.info("Loading response cache embedding model %s", self.embedding_model)
+            self._encoder = SentenceTransformer(self.embedding_model)
+        return self._encoder.encode([text], normalize_embeddings=True)[0].astype(np.float32)
+
+    def get_similar(self, embedding: np.ndarray, semantic_scope: str = "") -> Optional[str]:
+        """Response of the most similar cached prompt in a scope, within the threshold."""
+        index = self._semantic.get(semantic_scope)
+        if index is None or not index.responses:
+            return None
+
+        best, score = index.search(embedding)
+        if best < 0 or score < self.similarity_threshold:
+            return None
+        self.semantic_hits += 1
+        return index.responses[best]
+
+    def record_miss(self) -> None:
+        """Count a lookup that fell through to the LLM."""
+        self.misses += 1
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self._exact.clear()
+        self._semantic.clear()
+
+    def stats(self) -> dict:
+        """Cache size and hit counters."""
+        return {
+            "entries": len(self._exact),
+            "semantic_entries": sum(len(index.responses) for index in self._semantic.values()),
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses
+        }
+
+
+# Global response cache shared by all agents in the process
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the process-wide response cache, creating it on first use."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
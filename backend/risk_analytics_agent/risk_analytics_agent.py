@@ -4,16 +4,21 @@ Specializes in analyzing user assessment data and generating risk blueprints.
 """
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from langchain_ibm import ChatWatsonx
 
 from .base_agent import BaseAgent, AgentContext
 from .utils.financial_ratios import FinancialRatioEngine
+from .utils.ratio_kernels import compute_risk_score
 
 
 logger = logging.getLogger(__name__)
 
+# Risk levels as bits, ordered from most to least conservative
+_LEVEL_BIT = {'low': 1, 'medium': 2, 'high': 4}
+_BIT_LEVEL = {1: 'low', 2: 'medium', 4: 'high'}
+
 
 class RiskAnalyticsAgent(BaseAgent):
     """
@@ -94,14 +99,31 @@ TONE: Professional, analytical, confident, and educational. Explain complex conc
         assessment = self._normalize_user_assessment(context.user_assessment)
         
         # Step 1: Calculate comprehensive financial ratios using the engine
-        ratio_results = self.ratio_engine.calculate_all_ratios(assessment)
-        financial_ratios = self._extract_key_ratios(ratio_results)
-        ratio_summary = self.ratio_engine.generate_ratio_summary(ratio_results)
+        # (repeat profiles are served from the engine's own caches)
+        ratio_results, financial_ratios, ratio_summary = self._calculate_ratio_analysis(assessment)
         
         # Step 2: Assess risk components using enhanced ratio data
-        risk_capacity = self._assess_risk_capacity(assessment, financial_ratios, ratio_results)
-        risk_tolerance = self._assess_risk_tolerance(assessment)
-        risk_requirement = self._assess_risk_requirement(assessment)
+        # (normalization guarantees the numeric fields, so read them once here)
+        age = assessment['age']
+        income = assessment['income']
+        net_worth = assessment['net_worth']
+        dependents = assessment['dependents']
+        time_horizon = assessment['time_horizon']
+        target_amount = assessment['target_amount']
+        monthly_contribution = assessment['monthly_contribution']
+        
+        risk_capacity = self._assess_risk_capacity(
+            income, net_worth, age, dependents, financial_ratios, ratio_results
+        )
+        risk_tolerance = self._assess_risk_tolerance(
+            assessment['risk_tolerance'],
+            assessment.get('market_reaction', 'hold_course'),
+            assessment.get('investment_style', 'balanced'),
+            assessment.get('previous_experience', [])
+        )
+        risk_requirement = self._assess_risk_requirement(
+            time_horizon, target_amount, monthly_contribution, net_worth
+        )
         
         # Step 3: Calculate quantitative risk score using comprehensive data
         risk_score = self._calculate_enhanced_risk_score(assessment, financial_ratios, ratio_summary)
@@ -146,28 +168,14 @@ TONE: Professional, analytical, confident, and educational. Explain complex conc
             "confidence": 0.92
         }
 
-    def _extract_key_ratios(self, ratio_results: Dict[str, Any]) -> Dict[str, float]:
-        """Extract key ratio values for backward compatibility."""
-        key_ratios = {}
-        
-        # Extract the main ratios we use in other calculations
-        if "savings_rate" in ratio_results:
-            key_ratios["savings_rate"] = ratio_results["savings_rate"].value
-        
-        if "liquidity_ratio" in ratio_results:
-            key_ratios["liquidity_ratio"] = ratio_results["liquidity_ratio"].value
-            
-        if "debt_to_asset" in ratio_results:
-            key_ratios["debt_to_asset"] = ratio_results["debt_to_asset"].value
-            
-        if "debt_to_income" in ratio_results:
-            key_ratios["debt_to_income"] = ratio_results["debt_to_income"].value
-            
-        if "net_worth_to_income" in ratio_results:
-            key_ratios["net_worth_to_income"] = ratio_results["net_worth_to_income"].value
+    def _calculate_ratio_analysis(self, assessment: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, float], Dict[str, Any]]:
+        """Calculate ratio results, key ratios and ratio summary for an assessment."""
+        ratio_results = self.ratio_engine.calculate_all_ratios(assessment)
+        financial_ratios = self.ratio_engine.calculate_key_ratios(assessment)
+        ratio_summary = self.ratio_engine.generate_ratio_summary(ratio_results)
         
-        return key_ratios
-    
+        return ratio_results, financial_ratios, ratio_summary
+
     def _calculate_financial_ratios(self, assessment: Dict[str, Any]) -> Dict[str, float]:
         """Calculate key financial ratios from assessment data."""
         income = assessment.get('income', 0)
@@ -198,12 +206,13 @@ TONE: Professional, analytical, confident, and educational. Explain complex conc
                              volatility_target: float, financial_ratios: Dict[str, float]) -> Dict[str, Any]:
         """Create structured risk blueprint JSON."""
         
-        # Determine overall risk level
-        risk_levels = [risk_capacity['level'], risk_tolerance['level'], risk_requirement['level']]
-        risk_level_priority = {'low': 0, 'medium': 1, 'high': 2}
+        # Determine overall risk level, using the most conservative (lowest) level for safety
+        mask = (_LEVEL_BIT[risk_capacity['level']] |
+                _LEVEL_BIT[risk_tolerance['level']] |
+                _LEVEL_BIT[risk_requirement['level']])
+        overall_risk_level = _BIT_LEVEL[mask & -mask]  # lowest set bit
         
-        # Use the most conservative (lowest) risk level for safety
-        overall_risk_level = min(risk_levels, key=lambda x: risk_level_priority[x])
+        constraints = liquidity_constraints if isinstance(liquidity_constraints, dict) else {}
         
         return {
             # Keep original structure for main_agent.py compatibility
@@ -226,13 +235,13 @@ TONE: Professional, analytical, confident, and educational. Explain complex conc
             "risk_requirement_display": f"{risk_requirement['level']} - {risk_requirement['description']}",
             # Add sector and region data for equity selection agent
             "equity_selection_params": {
-                "sectors": liquidity_constraints.get("sector_preferences", []) if isinstance(liquidity_constraints, dict) else [],
-                "regions": liquidity_constraints.get("region_preferences", []) if isinstance(liquidity_constraints, dict) else [],
+                "sectors": constraints.get("sector_preferences", []),
+                "regions": constraints.get("region_preferences", []),
                 "volatility_target": volatility_target,
                 "risk_score": risk_score,
-                "liquidity_score": liquidity_constraints.get("liquidity_score", 0) if isinstance(liquidity_constraints, dict) else 0,
-                "age_factor": liquidity_constraints.get("age_factor", 35) if isinstance(liquidity_constraints, dict) else 35,
-                "dependent_factor": liquidity_constraints.get("dependent_factor", 0) if isinstance(liquidity_constraints, dict) else 0
+                "liquidity_score": constraints.get("liquidity_score", 0),
+                "age_factor": constraints.get("age_factor", 35),
+                "dependent_factor": constraints.get("dependent_factor", 0)
             }
         }
 
@@ -273,14 +282,10 @@ TONE: Professional, analytical, confident, and educational. Explain complex conc
             normalized['age'] = 35
         return normalized
     
-    def _assess_risk_capacity(self, assessment: Dict[str, Any], ratios: Dict[str, float], 
+    def _assess_risk_capacity(self, income: float, net_worth: float, age: int, dependents: int,
+                            ratios: Dict[str, float],
                             ratio_results: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Assess objective financial risk capacity."""
-        income = assessment.get('income', 0)
-        net_worth = assessment.get('net_worth', 0)
-        age = assessment.get('age', 35)
-        dependents = assessment.get('dependents', 0)
-        
         # Initialize factor contributions to safe defaults
         income_score = 0.0
         net_worth_score = 0.0
@@ -330,13 +335,9 @@ TONE: Professional, analytical, confident, and educational. Explain complex conc
             }
         }
     
-    def _assess_risk_tolerance(self, assessment: Dict[str, Any]) -> Dict[str, Any]:
+    def _assess_risk_tolerance(self, risk_tolerance: int, market_reaction: str,
+                             investment_style: str, previous_experience: List[Any]) -> Dict[str, Any]:
         """Assess psychological risk tolerance."""
-        risk_tolerance = assessment.get('risk_tolerance', 5)
-        market_reaction = assessment.get('market_reaction', 'hold_course')
-        investment_style = assessment.get('investment_style', 'balanced')
-        previous_experience = assessment.get('previous_experience', [])
-        
         # Base score from stated risk tolerance
         base_score = risk_tolerance * 10
         
@@ -388,14 +389,9 @@ TONE: Professional, analytical, confident, and educational. Explain complex conc
             }
         }
     
-    def _assess_risk_requirement(self, assessment: Dict[str, Any]) -> Dict[str, Any]:
+    def _assess_risk_requirement(self, time_horizon: int, target_amount: float,
+                               monthly_contribution: float, net_worth: float) -> Dict[str, Any]:
         """Assess required risk level to achieve financial goals."""
-        current_age = assessment.get('age', 35)
-        time_horizon = assessment.get('time_horizon', 10)
-        target_amount = assessment.get('target_amount', 500000)
-        monthly_contribution = assessment.get('monthly_contribution', 1000)
-        net_worth = assessment.get('net_worth', 100000)
-        
         # Calculate required return to reach goal
         total_contributions = monthly_contribution * 12 * time_horizon
         starting_value = net_worth
@@ -474,29 +470,13 @@ TONE: Professional, analytical, confident, and educational. Explain complex conc
         time_horizon = assessment.get('time_horizon', 10)
         risk_tolerance = assessment.get('risk_tolerance', 5)
         
-        # Age factor (younger = higher risk capacity)
-        age_score = max(0, min(100, 100 - (age - 20) * 1.5))
-        
-        # Time horizon factor
-        horizon_score = min(100, time_horizon * 4)
-        
-        # Risk tolerance factor
-        tolerance_score = risk_tolerance * 10
-        
-        # Financial capacity factor (based on ratios)
-        capacity_score = (
-            ratios['savings_rate'] * 1.5 +
-            min(50, ratios['liquidity_ratio'] * 10) +
-            max(0, 50 - ratios['debt_to_asset'])
-        )
-        
-        # Weighted combination
+        # Weighted combination of age, horizon, tolerance and capacity factors
         weights = self.risk_score_weights
-        final_score = (
-            age_score * weights['age_factor'] +
-            horizon_score * weights['time_horizon_factor'] +
-            tolerance_score * weights['risk_tolerance_factor'] +
-            capacity_score * weights['financial_capacity_factor']
+        final_score = compute_risk_score(
+            float(age), float(time_horizon), float(risk_tolerance),
+            float(ratios['savings_rate']), float(ratios['liquidity_ratio']), float(ratios['debt_to_asset']),
+            weights['age_factor'], weights['time_horizon_factor'],
+            weights['risk_tolerance_factor'], weights['financial_capacity_factor']
         )
         
         return int(max(1, min(100, final_score)))
@@ -604,7 +584,7 @@ Format your response professionally with clear sections and actionable insights.
             ai_response = await self._call_llm_with_retry(messages)
             return ai_response
         except Exception as e:
-            logger.warning(f"AI analysis generation failed: {e}")
+            logger.warning("AI analysis generation failed: %s", e)
             return self._generate_fallback_analysis(assessment, ratios, risk_capacity, risk_tolerance, risk_requirement, risk_score)
     
     def _format_ratio_summary_for_ai(self, ratio_summary: Dict[str, Any]) -> str:
@@ -0,0 +1,185 @@
+"""
+Session state storage for the Agent Coordinator.
+Uses Redis when a URL is configured so sessions expire on their own and are
+shared between API workers; falls back to a process-local dictionary.
+"""
+
+import json
+import logging
+import time
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+
+class InMemorySessionStore:
+    """Process-local session store backed by a dictionary."""
+
+    backend = "memory"
+
+    def __init__(self):
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+
+    async def create(self, session_id: str, data: Dict[str, Any]) -> None:
+        """Store a new session."""
+        self._sessions[session_id] = {**data, "completed_agents": []}
+
+    async def update(self, session_id: str, fields: Dict[str, Any]) -> None:
+        """Update fields of an existing session."""
+        if session_id in self._sessions:
+            self._sessions[session_id].update(fields)
+
+    async def append_agent(self, session_id: str, agent_record: Dict[str, Any]) -> None:
+        """Record a completed agent run for a session."""
+        if session_id in self._sessions:
+            self._sessions[session_id]["completed_agents"].append(agent_record)
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get session data or None if it does not exist."""
+        return self._sessions.get(session_id)
+
+    async def count(self) -> int:
+        """Number of stored sessions."""
+        return len(self._sessions)
+
+    async def recent(self, limit: int) -> List[Tuple[str, Dict[str, Any]]]:
+        """Up to ``limit`` most recently created sessions, newest first."""
+        # Dicts keep insertion order, so the newest sessions are at the end
+        return list(islice(reversed(self._sessions.items()), limit))
+
+    async def cleanup(self, max_age_seconds: float) -> int:
+        """Remove sessions older than max_age_seconds, returning how many were removed."""
+        cutoff = time.time() - max_age_seconds
+        # Rebuild in one pass rather than deleting keys one by one
+        kept = {
+            session_id: data for session_id, data in self._sessions.items()
+            if data["start_time"] >= cutoff
+        }
+        removed = len(self._sessions) - len(kept)
+        if removed:
+            self._sessions = kept
+        return removed
+
+
+class RedisSessionStore:
+    """
+    Redis-backed session store.
+
+    Each session is a hash at ``session:<id>`` with JSON-encoded values and
+    completed agent runs are a list at ``session_agents:<id>``; both carry a
+    TTL so expiry is handled by Redis. A sorted set of session ids scored by
+    start time serves counts and recent-session listings without scanning.
+    """
+
+    backend = "redis"
+    SESSION_PREFIX = "session:"
+    AGENTS_PREFIX = "session_agents:"
+    INDEX_KEY = "sessions_by_start"
+
+    def __init__(self, client: "aioredis.Redis", ttl_seconds: int):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+
+    async def create(self, session_id: str, data: Dict[str, Any]) -> None:
+        """Store a new session."""
+        key = self.SESSION_PREFIX + session_id
+        start_time = data.get("start_time", time.time())
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping={field: json.dumps(value, default=str) for field, value in data.items()})
+            pipe.expire(key, self.ttl_seconds)
+            pipe.zadd(self.INDEX_KEY, {session_id: start_time})
+            # Drop index entries whose sessions have expired
+            pipe.zremrangebyscore(self.INDEX_KEY, "-inf", f"({start_time - self.ttl_seconds}")
+            await pipe.execute()
+
+    async def update(self, session_id: str, fields: Dict[str, Any]) -> None:
+        """Update fields of an existing session."""
+        key = self.SESSION_PREFIX + session_id
+        if await self.client.exists(key):
+            await self.client.hset(key, mapping={field: json.dumps(value, default=str) for field, value in fields.items()})
+
+    async def append_agent(self, session_id: str, agent_record: Dict[str, Any]) -> None:
+        """Record a completed agent run for a session."""
+        key = self.AGENTS_PREFIX + session_id
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.rpush(key, json.dumps(agent_record, default=str))
+            pipe.expire(key, self.ttl_seconds)
+            await pipe.execute()
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get session data or None if it does not exist or has expired."""
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hgetall(self.SESSION_PREFIX + session_id)
+            pipe.lrange(self.AGENTS_PREFIX + session_id, 0, -1)
+            raw_session, raw_agents = await pipe.execute()
+        return self._load_session(raw_session, raw_agents)
+
+    async def count(self) -> int:
+        """Number of sessions started within the TTL."""
+        return await self.client.zcount(self.INDEX_KEY, time.time() - self.ttl_seconds, "+inf")
+
+    async def recent(self, limit: int) -> List[Tuple[str, Dict[str, Any]]]:
+        """Up to ``limit`` most recently created live sessions, newest first."""
+        session_ids = [self._decode(session_id) for session_id in
+                       await self.client.zrevrange(self.INDEX_KEY, 0, limit - 1)]
+        if not session_ids:
+            return []
+
+        # Fetch every listed session in a single round trip
+        async with self.client.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.hgetall(self.SESSION_PREFIX + session_id)
+                pipe.lrange(self.AGENTS_PREFIX + session_id, 0, -1)
+            replies = await pipe.execute()
+
+        sessions = []
+        for session_id, raw_session, raw_agents in zip(session_ids, replies[::2], replies[1::2]):
+            session = self._load_session(raw_session, raw_agents)
+            if session is not None:
+                sessions.append((session_id, session))
+        return sessions
+
+    async def cleanup(self, max_age_seconds: float) -> int:
+        """Expiry is handled by the Redis TTL, so there is nothing to remove."""
+        return 0
+
+    @classmethod
+    def _load_session(cls, raw_session: Dict[Any, Any], raw_agents: List[Any]) -> Optional[Dict[str, Any]]:
+        """Decode a session hash and its agent runs; None if the session has expired."""
+        if not raw_session:
+            return None
+
+        session = {cls._decode(field): json.loads(value) for field, value in raw_session.items()}
+        session["completed_agents"] = [json.loads(record) for record in raw_agents]
+        return session
+
+    @staticmethod
+    def _decode(value: Any) -> str:
+        return value.decode() if isinstance(value, bytes) else value
+
+
+def create_session_store(redis_url: Optional[str] = None, ttl_seconds: int = 24 * 3600):
+    """
+    Create the session store for the coordinator.
+
+    Args:
+        redis_url: Redis connection URL; the in-memory store is used if not set
+        ttl_seconds: Session lifetime when stored in Redis
+
+    Returns:
+        RedisSessionStore or InMemorySessionStore
+    """
+    if redis_url:
+        if REDIS_AVAILABLE:
+            logger.info("Using Redis session store")
+            return RedisSessionStore(aioredis.from_url(redis_url), ttl_seconds)
+        logger.warning("REDIS_URL is set but the redis package is not installed - using in-memory sessions")
+    return InMemorySessionStore()
@@ -3,15 +3,105 @@ Financial Ratio Calculation Engine for Risk Analytics.
 Provides comprehensive financial ratio calculations with validation and documentation.
 """
 
+import bisect
+import functools
 import logging
+from operator import itemgetter
+import sys
 from typing import Dict, Any, Optional, List, Tuple
-from dataclasses import dataclass
-from enum import Enum
+from dataclasses import dataclass, field
+from enum import Enum, IntEnum
 import numpy as np
 
+from .ratio_kernels import (compute_key_ratios, required_monthly_contribution, required_monthly_contributions,
+                            warm_up_kernels)
+
 
 logger = logging.getLogger(__name__)
 
+# Slotted dataclasses need Python 3.10+
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Benchmark bands, best first, and the quality score of each band and of
+# values beyond all bands
+BENCHMARK_QUALITIES = ("excellent", "good", "fair", "poor")
+QUALITY_SCORES = {"excellent": 90, "good": 75, "fair": 50, "poor": 25}
+ABOVE_RANGE = ("Above excellent range", 95)
+BELOW_RANGE = ("Below poor range", 10)
+
+# Assumed annual return of 7% (conservative), as a monthly rate
+_MONTHLY_R_7PCT = 0.07 / 12
+
+# Assessment fields that determine the financial profile, with their defaults
+_PROFILE_FIELDS = (
+    ("age", 35),
+    ("income", 0),
+    ("net_worth", 0),
+    ("monthly_contribution", 0),
+    ("dependents", 0),
+    ("time_horizon", 10),
+    ("target_amount", 0),
+)
+_profile_fields_getter = itemgetter(*(key for key, _ in _PROFILE_FIELDS))
+PROFILE_CACHE_SIZE = 1024
+
+# Ratios that cannot be calculated without income, with their error message
+_INCOME_DEPENDENT_RATIOS = {
+    "savings_rate": "No income data",
+    "debt_to_income": "No income data",
+    "net_worth_to_income": "No income data",
+    "investment_rate": "No income data",
+    "expense_ratio": "Insufficient data",
+}
+ESTIMATE_CACHE_SIZE = 4096
+
+# Batch warnings per ratio, mirroring the _calculate_* methods: the message for
+# rows that cannot be calculated (NaN), then (comparison, threshold, warning)
+# rules where the first match applies
+_BATCH_WARNING_RULES = {
+    "savings_rate": ("No income data", (
+        (np.greater, 50, "Extremely high savings rate - verify sustainability"),
+        (np.less, 5, "Very low savings rate - consider increasing contributions"),
+    )),
+    "liquidity_ratio": ("No expense data", (
+        (np.less, 3, "Insufficient emergency fund - aim for 3-6 months expenses"),
+        (np.greater, 12, "Excess liquidity - consider investing surplus funds"),
+    )),
+    "emergency_fund_ratio": ("No expense data", (
+        (np.less, 50, "Priority: Build emergency fund to 6 months expenses"),
+    )),
+    "debt_to_income": ("No income data", (
+        (np.greater, 50, "High debt burden - consider debt reduction strategy"),
+        (np.greater, 36, "Moderate debt burden - monitor carefully"),
+    )),
+    "debt_to_asset": ("No asset data", (
+        (np.greater, 60, "High leverage - significant financial risk"),
+        (np.greater, 40, "Moderate leverage - monitor debt levels"),
+    )),
+    "net_worth_to_income": ("No income data", (
+        (np.less, 0, "Negative net worth - focus on debt reduction"),
+        (np.less, 1, "Low net worth accumulation - increase savings"),
+    )),
+    "investment_rate": ("No income data", (
+        (np.less, 10, "Consider increasing investment contributions"),
+    )),
+    "expense_ratio": ("Insufficient data", (
+        (np.greater, 90, "High expenses limit savings capacity"),
+    )),
+    "financial_stability_score": (None, (
+        (np.less, 50, "Focus on building financial foundation"),
+    )),
+}
+
+
+class Ratio(IntEnum):
+    """Ratios with benchmarks, indexing the engine's benchmark array"""
+    SAVINGS_RATE = 0
+    LIQUIDITY_RATIO = 1
+    DEBT_TO_INCOME = 2
+    DEBT_TO_ASSET = 3
+    NET_WORTH_TO_INCOME = 4
+
 
 class RatioCategory(Enum):
     """Categories of financial ratios"""
@@ -22,7 +112,7 @@ class RatioCategory(Enum):
     RISK = "risk"
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class RatioResult:
     """Result of a financial ratio calculation"""
     name: str
@@ -31,11 +121,11 @@ class RatioResult:
     interpretation: str
     benchmark_range: Tuple[float, float]
     quality_score: int  # 1-100 scale
-    warning_flags: List[str]
+    warning_flags: Tuple[str, ...]
     calculation_method: str
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class FinancialProfile:
     """Structured financial profile for ratio calculations"""
     # Basic financial data
@@ -63,6 +153,82 @@ class FinancialProfile:
     # Additional context
     employment_stability: str = "stable"  # stable, unstable, self_employed
     industry: Optional[str] = None
+    
+    # Annual amounts derived from the monthly figures
+    annual_contribution: float = field(init=False)
+    annual_expenses: Optional[float] = field(init=False)
+    
+    def __post_init__(self):
+        # Frozen dataclass: derived fields are set through object.__setattr__
+        object.__setattr__(self, "annual_contribution", self.monthly_contribution * 12)
+        object.__setattr__(self, "annual_expenses",
+                           None if self.monthly_expenses is None else self.monthly_expenses * 12)
+
+
+@functools.lru_cache(maxsize=ESTIMATE_CACHE_SIZE)
+def _estimate_profile_values(annual_income: float, net_worth: float, dependents: int,
+                             age: int) -> Tuple[float, float, float]:
+    """
+    Estimate monthly expenses, liquid assets and total debt from the
+    assessment. Cached separately from whole profiles, since assessments in
+    the same demographic bucket share these inputs but not their goals.
+    """
+    # Expenses are 70% of income, 15% more per dependent and 0.2% more per
+    # year after 50 (capped at 95%), with a $3,000 minimum assumption
+    if annual_income > 0:
+        expense_ratio = min(0.95, 0.70 + dependents * 0.15 + max(0, (age - 50) * 0.002))
+        estimated_monthly_expenses = (annual_income * expense_ratio) / 12
+    else:
+        estimated_monthly_expenses = 3000
+    
+    # 30-60% of net worth is liquid, less as it grows; 10% of income without net worth
+    if net_worth > 0:
+        estimated_liquid_assets = net_worth * (0.6 if net_worth < 100000 else 0.4 if net_worth < 500000 else 0.3)
+    else:
+        estimated_liquid_assets = max(0, annual_income * 0.1)
+    
+    # Younger people typically carry more debt (student loans, mortgages),
+    # bounded by what is reasonable relative to income and net worth
+    if annual_income > 0:
+        debt_to_income_ratio = 0.4 if age < 30 else 0.3 if age < 45 else 0.2
+        estimated_total_debt = min(annual_income * debt_to_income_ratio,
+                                   max(annual_income * 0.5, net_worth * 0.3))
+    else:
+        estimated_total_debt = 0
+    
+    return estimated_monthly_expenses, estimated_liquid_assets, estimated_total_debt
+
+
+def _profile_key(assessment_data: Dict[str, Any]) -> Tuple:
+    """Profile inputs of an assessment, in _PROFILE_FIELDS order."""
+    try:
+        # Complete assessments are read with a single C-level call
+        return _profile_fields_getter(assessment_data)
+    except KeyError:
+        return tuple(assessment_data.get(key, default) for key, default in _PROFILE_FIELDS)
+
+
+class _PartialRatiosError(Exception):
+    """A ratio calculation failed; carries the ratios calculated before it."""
+
+    def __init__(self, ratios: Dict[str, "RatioResult"]):
+        super().__init__()
+        self.ratios = ratios
+
+
+@functools.lru_cache(maxsize=None)
+def _error_ratio(ratio_name: str, error_msg: str) -> RatioResult:
+    """Error RatioResult for a ratio and message, built once per pair."""
+    return RatioResult(
+        name=ratio_name.replace("_", " ").title(),
+        value=0.0,
+        category=RatioCategory.RISK,
+        interpretation=f"Calculation error: {error_msg}",
+        benchmark_range=(0, 0),
+        quality_score=0,
+        warning_flags=(error_msg,),
+        calculation_method="Error in calculation"
+    )
 
 
 class FinancialRatioEngine:
@@ -108,72 +274,300 @@ class FinancialRatioEngine:
             }
         }
         
+        # (ratio, band, min/max) array of the benchmarks, indexed by Ratio and
+        # BENCHMARK_QUALITIES; the "good" band is reported with each result
+        self._bench = np.array(
+            [[self.benchmarks[ratio.name.lower()][quality] for quality in BENCHMARK_QUALITIES] for ratio in Ratio],
+            dtype=np.float64
+        )
+        self._good_ranges = [self.benchmarks[ratio.name.lower()]["good"] for ratio in Ratio]
+        
+        # Sorted band edges per ratio for _interpret_ratio
+        self._edge_tbl = {ratio.name.lower(): self._build_edge_table(self._bench[ratio]) for ratio in Ratio}
+        
+        # Ratio calculations in result order, bound once
+        self._ratio_methods = (
+            # Liquidity ratios
+            ("savings_rate", self._calculate_savings_rate),
+            ("liquidity_ratio", self._calculate_liquidity_ratio),
+            ("emergency_fund_ratio", self._calculate_emergency_fund_ratio),
+            # Solvency ratios
+            ("debt_to_income", self._calculate_debt_to_income_ratio),
+            ("debt_to_asset", self._calculate_debt_to_asset_ratio),
+            ("net_worth_to_income", self._calculate_net_worth_to_income_ratio),
+            # Efficiency ratios
+            ("investment_rate", self._calculate_investment_rate),
+            ("expense_ratio", self._calculate_expense_ratio),
+            # Risk ratios
+            ("financial_stability_score", self._calculate_financial_stability_score),
+            ("goal_feasibility_ratio", self._calculate_goal_feasibility_ratio),
+        )
+        
+        # Without income, income-dependent ratios are known errors up front
+        def income_error(ratio_name: str):
+            error = _error_ratio(ratio_name, _INCOME_DEPENDENT_RATIOS[ratio_name])
+            return lambda profile: error
+        
+        self._no_income_ratio_methods = tuple(
+            (ratio_name, income_error(ratio_name) if ratio_name in _INCOME_DEPENDENT_RATIOS else calculate)
+            for ratio_name, calculate in self._ratio_methods
+        )
+        
+        # Profiles and ratio results are memoized per distinct set of profile
+        # inputs; results also depend on the benchmarks, tracked by version
+        self._benchmark_version = 0
+        self._cached_profile = functools.lru_cache(maxsize=PROFILE_CACHE_SIZE)(self._build_financial_profile)
+        self._cached_ratios = functools.lru_cache(maxsize=PROFILE_CACHE_SIZE)(self._calculate_ratios_for_key)
+        
+        # Compile the ratio kernels now rather than on the first request
+        warm_up_kernels()
+        
         logger.info("Financial Ratio Engine initialized with industry benchmarks")
     
+    def update_benchmarks(self, ratio_name: str, bands: Dict[str, Tuple[float, float]]) -> None:
+        """Replace the benchmark bands of a ratio, invalidating cached results."""
+        ratio = Ratio[ratio_name.upper()]
+        self.benchmarks[ratio_name] = bands
+        self._bench[ratio] = [bands[quality] for quality in BENCHMARK_QUALITIES]
+        self._good_ranges[ratio] = bands["good"]
+        self._edge_tbl[ratio_name] = self._build_edge_table(self._bench[ratio])
+        self._benchmark_version += 1
+        self._cached_ratios.cache_clear()
+    
     def calculate_all_ratios(self, assessment_data: Dict[str, Any]) -> Dict[str, RatioResult]:
         """
         Calculate all relevant financial ratios from assessment data.
         
+        Results are memoized on the profile inputs; the RatioResults are
+        immutable, and each call returns its own dictionary.
+        
         Args:
             assessment_data: User assessment data dictionary
             
         Returns:
             Dictionary of ratio names to RatioResult objects
         """
+        key = _profile_key(assessment_data)
+        try:
+            try:
+                return dict(self._cached_ratios(self._benchmark_version, key))
+            except TypeError:
+                # Unhashable input values; calculate without caching
+                return self._calculate_ratios_for_key(self._benchmark_version, key)
+        except _PartialRatiosError as e:
+            # Failed calculations raise out of the cache, so partial results are not memoized
+            logger.error("Error calculating financial ratios: %s", e.__cause__)
+            return e.ratios
+    
+    def _calculate_ratios_for_key(self, benchmark_version: int, key: Tuple) -> Dict[str, RatioResult]:
+        """Calculate all ratios for a profile key (see calculate_all_ratios)."""
         # Convert assessment data to structured profile
-        profile = self._create_financial_profile(assessment_data)
+        profile = self._profile_for_key(key)
         
-        # Validate profile data
-        validation_result = self._validate_profile(profile)
-        if not validation_result["valid"]:
-            logger.warning(f"Profile validation issues: {validation_result['warnings']}")
+        # Validate profile data (only reported, so skipped when warnings are not logged)
+        if logger.isEnabledFor(logging.WARNING):
+            validation_result = self._validate_profile(profile)
+            if not validation_result["valid"]:
+                logger.warning("Profile validation issues: %s", validation_result['warnings'])
         
-        # Calculate individual ratios
+        # Calculate individual ratios, skipping those that need income when there is none
+        if profile.annual_income > 0:
+            calculations = self._ratio_methods
+        else:
+            calculations = self._no_income_ratio_methods
         ratios = {}
         
         try:
-            # Liquidity ratios
-            ratios["savings_rate"] = self._calculate_savings_rate(profile)
-            ratios["liquidity_ratio"] = self._calculate_liquidity_ratio(profile)
-            ratios["emergency_fund_ratio"] = self._calculate_emergency_fund_ratio(profile)
-            
-            # Solvency ratios
-            ratios["debt_to_income"] = self._calculate_debt_to_income_ratio(profile)
-            ratios["debt_to_asset"] = self._calculate_debt_to_asset_ratio(profile)
-            ratios["net_worth_to_income"] = self._calculate_net_worth_to_income_ratio(profile)
-            
-            # Efficiency ratios
-            ratios["investment_rate"] = self._calculate_investment_rate(profile)
-            ratios["expense_ratio"] = self._calculate_expense_ratio(profile)
-            
-            # Risk ratios
-            ratios["financial_stability_score"] = self._calculate_financial_stability_score(profile)
-            ratios["goal_feasibility_ratio"] = self._calculate_goal_feasibility_ratio(profile)
-            
-            logger.info(f"Successfully calculated {len(ratios)} financial ratios")
-            
+            for ratio_name, calculate in calculations:
+                ratios[ratio_name] = calculate(profile)
         except Exception as e:
-            logger.error(f"Error calculating financial ratios: {e}")
-            # Return partial results if some calculations failed
+            # Partial results are returned by calculate_all_ratios
+            raise _PartialRatiosError(ratios) from e
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Calculated %d financial ratios", len(ratios))
         
         return ratios
-    
+
+    def calculate_key_ratios(self, assessment_data: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Calculate only the key ratio values used for risk scoring.
+
+        Runs the compiled ratio kernel on the estimated profile instead of
+        building a RatioResult per ratio.
+
+        Args:
+            assessment_data: User assessment data dictionary
+
+        Returns:
+            Dictionary of key ratio names to values
+        """
+        profile = self._create_financial_profile(assessment_data)
+
+        savings_rate, liquidity_ratio, debt_to_asset, debt_to_income, net_worth_to_income = compute_key_ratios(
+            float(profile.annual_income),
+            float(profile.net_worth),
+            float(profile.monthly_contribution),
+            float(profile.liquid_assets or 0),
+            float(profile.total_assets or profile.net_worth),
+            float(profile.total_debt or 0),
+            float(profile.monthly_expenses or 0)
+        )
+
+        return {
+            "savings_rate": savings_rate,
+            "liquidity_ratio": liquidity_ratio,
+            "debt_to_asset": debt_to_asset,
+            "debt_to_income": debt_to_income,
+            "net_worth_to_income": net_worth_to_income
+        }
+
+    def calculate_all_ratios_batch(self, rows: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """
+        Calculate every ratio value for many assessments at once.
+
+        Uses the same estimates and formulas as calculate_all_ratios, as array
+        expressions over all rows. Ratios that cannot be calculated for a row
+        (e.g. no income) are NaN. Interpretations are not built; see
+        calculate_ratio_warnings_batch for warnings, and use
+        calculate_all_ratios(rows[i]) for the full RatioResult objects of a
+        single row.
+
+        Args:
+            rows: User assessment data dictionaries
+
+        Returns:
+            Dictionary of ratio names to arrays of values, one per row
+        """
+        return self._ratio_arrays(rows)[0]
+
+    def calculate_ratio_warnings_batch(self, rows: List[Dict[str, Any]]) -> Dict[str, List[Tuple[str, ...]]]:
+        """
+        Build the warning flags of every ratio for many assessments at once.
+
+        Warnings are selected with boolean masks over the batch ratio values
+        rather than per-row branches.
+
+        Args:
+            rows: User assessment data dictionaries
+
+        Returns:
+            Dictionary of ratio names to per-row warning flags, as in
+            RatioResult.warning_flags
+        """
+        values, required = self._ratio_arrays(rows)
+        warnings = {}
+
+        for ratio_name, (error_msg, rules) in _BATCH_WARNING_RULES.items():
+            ratio_values = values[ratio_name]
+            flags = np.select(
+                [compare(ratio_values, threshold) for compare, threshold, _ in rules],
+                [message for _, _, message in rules],
+                default=""
+            )
+            if error_msg is not None:
+                flags = np.where(np.isnan(ratio_values), error_msg, flags)
+            warnings[ratio_name] = [(flag,) if flag else () for flag in flags.tolist()]
+
+        # The goal feasibility warning quotes each row's required contribution
+        feasibility = values["goal_feasibility_ratio"]
+        goal_flags = np.where(np.isnan(feasibility), "No goal data", "").astype(object)
+        low_feasibility = feasibility < 75
+        goal_flags[low_feasibility] = [
+            f"Consider increasing monthly contribution to ${amount:.0f}" for amount in required[low_feasibility].tolist()
+        ]
+        warnings["goal_feasibility_ratio"] = [(flag,) if flag else () for flag in goal_flags.tolist()]
+
+        return warnings
+
+    def _ratio_arrays(self, rows: List[Dict[str, Any]]) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Batch ratio values and the required monthly contributions behind goal feasibility."""
+        n = len(rows)
+
+        def column(key: str, default: float) -> np.ndarray:
+            return np.fromiter((float(row.get(key, default)) for row in rows), dtype=np.float64, count=n)
+
+        age = column('age', 35)
+        income = column('income', 0)
+        net_worth = column('net_worth', 0)
+        contribution = column('monthly_contribution', 0)
+        dependents = column('dependents', 0)
+        time_horizon = column('time_horizon', 10)
+        target_amount = column('target_amount', 0)
+
+        has_income = income > 0
+        safe_income = np.where(has_income, income, np.nan)
+
+        # Estimates (see _estimate_profile_values)
+        expense_share = np.minimum(0.95, 0.70 + dependents * 0.15 + np.maximum(0, (age - 50) * 0.002))
+        expenses = np.where(has_income, income * expense_share / 12, 3000.0)
+        liquid_share = np.select([net_worth < 100000, net_worth < 500000], [0.6, 0.4], 0.3)
+        liquid = np.where(net_worth > 0, net_worth * liquid_share, np.maximum(0, income * 0.1))
+        debt_share = np.select([age < 30, age < 45], [0.4, 0.3], 0.2)
+        debt = np.where(
+            has_income,
+            np.minimum(income * debt_share, np.maximum(income * 0.5, net_worth * 0.3)),
+            0.0
+        )
+        total_assets = net_worth + debt
+        # total_assets falls back to net worth when zero, as in the scalar path
+        total_assets = np.where(total_assets != 0, total_assets, net_worth)
+
+        has_expenses = expenses > 0
+        safe_expenses = np.where(has_expenses, expenses, np.nan)
+
+        savings_rate = contribution * 12 / safe_income * 100
+        debt_to_income = debt / safe_income * 100
+        liquidity_ratio = liquid / safe_expenses
+
+        # Financial stability: mean of income, debt, liquidity and savings component scores
+        income_score = np.select([age >= 30, age >= 25], [80.0, 60.0], 40.0)
+        debt_score = np.where((debt != 0) & has_income, np.maximum(0, 100 - np.nan_to_num(debt_to_income) * 2), 80.0)
+        liquidity_score = np.where((liquid != 0) & (expenses != 0),
+                                   np.minimum(100, np.nan_to_num(liquidity_ratio) * 20), 30.0)
+        savings_score = np.where(has_income, np.minimum(100, np.nan_to_num(savings_rate) * 5), 0.0)
+        stability = (income_score + debt_score + liquidity_score + savings_score) / 4
+
+        # Goal feasibility: current contribution against the PMT needed at 7% a year
+        has_goal = (target_amount > 0) & (time_horizon > 0)
+        required = required_monthly_contributions(np.maximum(0, net_worth), target_amount,
+                                                  time_horizon * 12, _MONTHLY_R_7PCT)
+        feasibility = np.where(has_goal, contribution / np.maximum(required, 1) * 100, np.nan)
+
+        values = {
+            "savings_rate": savings_rate,
+            "liquidity_ratio": liquidity_ratio,
+            "emergency_fund_ratio": liquid / (safe_expenses * 6) * 100,
+            "debt_to_income": debt_to_income,
+            "debt_to_asset": np.where(total_assets > 0, debt / np.where(total_assets > 0, total_assets, 1) * 100, np.nan),
+            "net_worth_to_income": net_worth / safe_income,
+            "investment_rate": savings_rate.copy(),
+            "expense_ratio": expenses * 12 / safe_income * 100,
+            "financial_stability_score": stability,
+            "goal_feasibility_ratio": feasibility
+        }
+        return values, required
+
     def _create_financial_profile(self, assessment_data: Dict[str, Any]) -> FinancialProfile:
         """Convert assessment data to structured financial profile."""
-        
-        # Extract basic data
-        age = assessment_data.get('age', 35)
-        annual_income = assessment_data.get('income', 0)
-        net_worth = assessment_data.get('net_worth', 0)
-        monthly_contribution = assessment_data.get('monthly_contribution', 0)
-        dependents = assessment_data.get('dependents', 0)
-        time_horizon = assessment_data.get('time_horizon', 10)
-        target_amount = assessment_data.get('target_amount', 0)
+        return self._profile_for_key(_profile_key(assessment_data))
+    
+    def _profile_for_key(self, key: Tuple) -> FinancialProfile:
+        """Memoized profile for a profile key."""
+        try:
+            return self._cached_profile(*key)
+        except TypeError:
+            return self._build_financial_profile(*key)
+    
+    def _build_financial_profile(self, age: int, annual_income: float, net_worth: float,
+                                 monthly_contribution: float, dependents: int,
+                                 time_horizon: int, target_amount: float) -> FinancialProfile:
+        """Build the financial profile, estimating values the assessment does not provide."""
         
         # Estimate missing values using heuristics
-        estimated_monthly_expenses = self._estimate_monthly_expenses(annual_income, dependents, age)
-        estimated_liquid_assets = self._estimate_liquid_assets(net_worth, annual_income)
-        estimated_total_debt = self._estimate_total_debt(annual_income, net_worth, age)
+        estimated_monthly_expenses, estimated_liquid_assets, estimated_total_debt = _estimate_profile_values(
+            annual_income, net_worth, dependents, age
+        )
         estimated_total_assets = net_worth + estimated_total_debt
         
         return FinancialProfile(
@@ -190,59 +584,6 @@ class FinancialRatioEngine:
             target_amount=target_amount
         )
     
-    def _estimate_monthly_expenses(self, annual_income: float, dependents: int, age: int) -> float:
-        """Estimate monthly expenses based on income, dependents, and age."""
-        if annual_income <= 0:
-            return 3000  # Minimum assumption
-        
-        # Base expense ratio (percentage of income)
-        base_ratio = 0.70  # 70% of income for expenses
-        
-        # Adjust for dependents
-        dependent_adjustment = dependents * 0.15  # 15% more per dependent
-        
-        # Adjust for age (older people might have higher healthcare costs)
-        age_adjustment = max(0, (age - 50) * 0.002)  # 0.2% more per year after 50
-        
-        total_ratio = min(0.95, base_ratio + dependent_adjustment + age_adjustment)
-        
-        return (annual_income * total_ratio) / 12
-    
-    def _estimate_liquid_assets(self, net_worth: float, annual_income: float) -> float:
-        """Estimate liquid assets as portion of net worth."""
-        if net_worth <= 0:
-            return max(0, annual_income * 0.1)  # 10% of income if no net worth
-        
-        # Assume 30-60% of net worth is liquid depending on total net worth
-        if net_worth < 100000:
-            liquidity_ratio = 0.6  # Higher liquidity for smaller net worth
-        elif net_worth < 500000:
-            liquidity_ratio = 0.4
-        else:
-            liquidity_ratio = 0.3  # Lower liquidity for higher net worth (more investments)
-        
-        return net_worth * liquidity_ratio
-    
-    def _estimate_total_debt(self, annual_income: float, net_worth: float, age: int) -> float:
-        """Estimate total debt based on income, net worth, and age."""
-        if annual_income <= 0:
-            return 0
-        
-        # Younger people typically have more debt (student loans, mortgages)
-        if age < 30:
-            debt_to_income_ratio = 0.4  # 40% of income
-        elif age < 45:
-            debt_to_income_ratio = 0.3  # 30% of income
-        else:
-            debt_to_income_ratio = 0.2  # 20% of income
-        
-        estimated_debt = annual_income * debt_to_income_ratio
-        
-        # Ensure debt doesn't exceed reasonable bounds relative to net worth
-        max_reasonable_debt = max(annual_income * 0.5, net_worth * 0.3)
-        
-        return min(estimated_debt, max_reasonable_debt)
-    
     def _validate_profile(self, profile: FinancialProfile) -> Dict[str, Any]:
         """Validate financial profile data for consistency and reasonableness."""
         warnings = []
@@ -274,24 +615,25 @@ class FinancialRatioEngine:
         if profile.annual_income <= 0:
             return self._create_error_ratio("savings_rate", "No income data")
         
-        annual_savings = profile.monthly_contribution * 12
+        annual_savings = profile.annual_contribution
         savings_rate = (annual_savings / profile.annual_income) * 100
         
         # Interpretation
         interpretation, quality_score = self._interpret_ratio("savings_rate", savings_rate)
         
-        warnings = []
         if savings_rate > 50:
-            warnings.append("Extremely high savings rate - verify sustainability")
+            warnings = ("Extremely high savings rate - verify sustainability",)
         elif savings_rate < 5:
-            warnings.append("Very low savings rate - consider increasing contributions")
+            warnings = ("Very low savings rate - consider increasing contributions",)
+        else:
+            warnings = ()
         
         return RatioResult(
             name="Savings Rate",
             value=savings_rate,
             category=RatioCategory.EFFICIENCY,
             interpretation=interpretation,
-            benchmark_range=self.benchmarks["savings_rate"]["good"],
+            benchmark_range=self._good_ranges[Ratio.SAVINGS_RATE],
             quality_score=quality_score,
             warning_flags=warnings,
             calculation_method="(Monthly Contribution × 12) / Annual Income × 100"
@@ -307,18 +649,19 @@ class FinancialRatioEngine:
         
         interpretation, quality_score = self._interpret_ratio("liquidity_ratio", liquidity_months)
         
-        warnings = []
         if liquidity_months < 3:
-            warnings.append("Insufficient emergency fund - aim for 3-6 months expenses")
+            warnings = ("Insufficient emergency fund - aim for 3-6 months expenses",)
         elif liquidity_months > 12:
-            warnings.append("Excess liquidity - consider investing surplus funds")
+            warnings = ("Excess liquidity - consider investing surplus funds",)
+        else:
+            warnings = ()
         
         return RatioResult(
             name="Liquidity Ratio",
             value=liquidity_months,
             category=RatioCategory.LIQUIDITY,
             interpretation=interpretation,
-            benchmark_range=self.benchmarks["liquidity_ratio"]["good"],
+            benchmark_range=self._good_ranges[Ratio.LIQUIDITY_RATIO],
             quality_score=quality_score,
             warning_flags=warnings,
             calculation_method="Liquid Assets / Monthly Expenses"
@@ -348,9 +691,10 @@ class FinancialRatioEngine:
             interpretation = "Insufficient emergency fund"
             quality_score = 25
         
-        warnings = []
         if adequacy_ratio < 50:
-            warnings.append("Priority: Build emergency fund to 6 months expenses")
+            warnings = ("Priority: Build emergency fund to 6 months expenses",)
+        else:
+            warnings = ()
         
         return RatioResult(
             name="Emergency Fund Adequacy",
@@ -373,18 +717,19 @@ class FinancialRatioEngine:
         
         interpretation, quality_score = self._interpret_ratio("debt_to_income", debt_to_income)
         
-        warnings = []
         if debt_to_income > 50:
-            warnings.append("High debt burden - consider debt reduction strategy")
+            warnings = ("High debt burden - consider debt reduction strategy",)
         elif debt_to_income > 36:
-            warnings.append("Moderate debt burden - monitor carefully")
+            warnings = ("Moderate debt burden - monitor carefully",)
+        else:
+            warnings = ()
         
         return RatioResult(
             name="Debt-to-Income Ratio",
             value=debt_to_income,
             category=RatioCategory.SOLVENCY,
             interpretation=interpretation,
-            benchmark_range=self.benchmarks["debt_to_income"]["good"],
+            benchmark_range=self._good_ranges[Ratio.DEBT_TO_INCOME],
             quality_score=quality_score,
             warning_flags=warnings,
             calculation_method="Total Debt / Annual Income × 100"
@@ -401,18 +746,19 @@ class FinancialRatioEngine:
         
         interpretation, quality_score = self._interpret_ratio("debt_to_asset", debt_to_asset)
         
-        warnings = []
         if debt_to_asset > 60:
-            warnings.append("High leverage - significant financial risk")
+            warnings = ("High leverage - significant financial risk",)
         elif debt_to_asset > 40:
-            warnings.append("Moderate leverage - monitor debt levels")
+            warnings = ("Moderate leverage - monitor debt levels",)
+        else:
+            warnings = ()
         
         return RatioResult(
             name="Debt-to-Asset Ratio",
             value=debt_to_asset,
             category=RatioCategory.SOLVENCY,
             interpretation=interpretation,
-            benchmark_range=self.benchmarks["debt_to_asset"]["good"],
+            benchmark_range=self._good_ranges[Ratio.DEBT_TO_ASSET],
             quality_score=quality_score,
             warning_flags=warnings,
             calculation_method="Total Debt / Total Assets × 100"
@@ -427,18 +773,19 @@ class FinancialRatioEngine:
         
         interpretation, quality_score = self._interpret_ratio("net_worth_to_income", net_worth_multiple)
         
-        warnings = []
         if net_worth_multiple < 0:
-            warnings.append("Negative net worth - focus on debt reduction")
+            warnings = ("Negative net worth - focus on debt reduction",)
         elif net_worth_multiple < 1:
-            warnings.append("Low net worth accumulation - increase savings")
+            warnings = ("Low net worth accumulation - increase savings",)
+        else:
+            warnings = ()
         
         return RatioResult(
             name="Net Worth to Income Multiple",
             value=net_worth_multiple,
             category=RatioCategory.PROFITABILITY,
             interpretation=interpretation,
-            benchmark_range=self.benchmarks["net_worth_to_income"]["good"],
+            benchmark_range=self._good_ranges[Ratio.NET_WORTH_TO_INCOME],
             quality_score=quality_score,
             warning_flags=warnings,
             calculation_method="Net Worth / Annual Income"
@@ -449,7 +796,7 @@ class FinancialRatioEngine:
         if profile.annual_income <= 0:
             return self._create_error_ratio("investment_rate", "No income data")
         
-        annual_investment = profile.monthly_contribution * 12
+        annual_investment = profile.annual_contribution
         investment_rate = (annual_investment / profile.annual_income) * 100
         
         # Age-adjusted benchmarks
@@ -469,9 +816,10 @@ class FinancialRatioEngine:
             interpretation = f"Low investment rate (target: {recommended_rate:.0f}%)"
             quality_score = 25
         
-        warnings = []
         if investment_rate < 10:
-            warnings.append("Consider increasing investment contributions")
+            warnings = ("Consider increasing investment contributions",)
+        else:
+            warnings = ()
         
         return RatioResult(
             name="Investment Rate",
@@ -489,7 +837,7 @@ class FinancialRatioEngine:
         if profile.annual_income <= 0 or not profile.monthly_expenses:
             return self._create_error_ratio("expense_ratio", "Insufficient data")
         
-        annual_expenses = profile.monthly_expenses * 12
+        annual_expenses = profile.annual_expenses
         expense_ratio = (annual_expenses / profile.annual_income) * 100
         
         if expense_ratio <= 60:
@@ -505,9 +853,10 @@ class FinancialRatioEngine:
             interpretation = "High expense ratio"
             quality_score = 25
         
-        warnings = []
         if expense_ratio > 90:
-            warnings.append("High expenses limit savings capacity")
+            warnings = ("High expenses limit savings capacity",)
+        else:
+            warnings = ()
         
         return RatioResult(
             name="Expense Ratio",
@@ -524,8 +873,6 @@ class FinancialRatioEngine:
         """Calculate overall financial stability score."""
         
         # Component scores (0-100 each)
-        scores = []
-        
         # Income stability (based on age and employment)
         if profile.age >= 30:
             income_score = 80
@@ -533,7 +880,6 @@ class FinancialRatioEngine:
             income_score = 60
         else:
             income_score = 40
-        scores.append(income_score)
         
         # Debt burden score
         if profile.total_debt and profile.annual_income > 0:
@@ -541,7 +887,6 @@ class FinancialRatioEngine:
             debt_score = max(0, 100 - debt_ratio * 2)  # Penalty for high debt
         else:
             debt_score = 80
-        scores.append(debt_score)
         
         # Liquidity score
         if profile.liquid_assets and profile.monthly_expenses:
@@ -549,18 +894,16 @@ class FinancialRatioEngine:
             liquidity_score = min(100, liquidity_months * 20)  # 20 points per month
         else:
             liquidity_score = 30
-        scores.append(liquidity_score)
         
         # Savings score
         if profile.annual_income > 0:
-            savings_rate = (profile.monthly_contribution * 12 / profile.annual_income) * 100
+            savings_rate = (profile.annual_contribution / profile.annual_income) * 100
             savings_score = min(100, savings_rate * 5)  # 5 points per percent
         else:
             savings_score = 0
-        scores.append(savings_score)
         
-        # Calculate weighted average
-        stability_score = np.mean(scores)
+        # Average of the four components
+        stability_score = (income_score + debt_score + liquidity_score + savings_score) * 0.25
         
         if stability_score >= 80:
             interpretation = "Excellent financial stability"
@@ -575,9 +918,10 @@ class FinancialRatioEngine:
             interpretation = "Low financial stability"
             quality_score = 25
         
-        warnings = []
         if stability_score < 50:
-            warnings.append("Focus on building financial foundation")
+            warnings = ("Focus on building financial foundation",)
+        else:
+            warnings = ()
         
         return RatioResult(
             name="Financial Stability Score",
@@ -601,23 +945,10 @@ class FinancialRatioEngine:
         future_value_needed = profile.target_amount
         months = profile.time_horizon * 12
         
-        # Assume 7% annual return (conservative)
-        monthly_return = 0.07 / 12
-        
-        # Calculate required monthly payment using PMT formula
-        if monthly_return > 0:
-            # Future value of current investments
-            fv_current = current_value * ((1 + monthly_return) ** months)
-            # Remaining amount needed from contributions
-            remaining_needed = future_value_needed - fv_current
-            
-            if remaining_needed > 0:
-                # Required monthly contribution
-                required_monthly = remaining_needed / (((1 + monthly_return) ** months - 1) / monthly_return)
-            else:
-                required_monthly = 0
-        else:
-            required_monthly = (future_value_needed - current_value) / months
+        # Calculate required monthly payment using PMT formula (compiled kernel)
+        required_monthly = required_monthly_contribution(
+            float(current_value), float(future_value_needed), float(months), _MONTHLY_R_7PCT
+        )
         
         # Compare with current contribution
         current_monthly = profile.monthly_contribution
@@ -636,9 +967,10 @@ class FinancialRatioEngine:
             interpretation = "Goal may not be achievable without major changes"
             quality_score = 25
         
-        warnings = []
         if feasibility_ratio < 75:
-            warnings.append(f"Consider increasing monthly contribution to ${required_monthly:.0f}")
+            warnings = (f"Consider increasing monthly contribution to ${required_monthly:.0f}",)
+        else:
+            warnings = ()
         
         return RatioResult(
             name="Goal Feasibility Ratio",
@@ -651,63 +983,88 @@ class FinancialRatioEngine:
             calculation_method="Current Monthly Savings / Required Monthly Savings × 100"
         )
     
-    def _interpret_ratio(self, ratio_name: str, value: float) -> Tuple[str, int]:
-        """Interpret ratio value against benchmarks."""
-        if ratio_name not in self.benchmarks:
-            return "No benchmark available", 50
+    @staticmethod
+    def _build_edge_table(bands: np.ndarray) -> Tuple[Tuple[float, ...], str, Tuple[str, ...], Tuple[int, ...]]:
+        """
+        Turn a ratio's (min, max) benchmark bands into sorted edges for bisect
+        and np.searchsorted.
+        
+        Bands are rows in BENCHMARK_QUALITIES order. They are inclusive, and a
+        value on a shared edge belongs to the better band, which fixes the
+        searchsorted side.
         
-        benchmarks = self.benchmarks[ratio_name]
-        
-        for quality, (min_val, max_val) in benchmarks.items():
-            if min_val <= value <= max_val:
-                quality_scores = {
-                    "excellent": 90,
-                    "good": 75,
-                    "fair": 50,
-                    "poor": 25
-                }
-                return f"{quality.title()} range", quality_scores[quality]
-        
-        # Value outside all ranges
-        if value > max(range_vals[1] for range_vals in benchmarks.values()):
-            return "Above excellent range", 95
+        Returns:
+            (edges, side, labels, scores) where labels/scores are indexed by
+            the searchsorted position: below all bands, each band, above all bands
+        """
+        ordered = sorted(zip(BENCHMARK_QUALITIES, bands.tolist()), key=lambda item: item[1][0])
+        for (_, (_, upper)), (_, (lower, _)) in zip(ordered, ordered[1:]):
+            if upper != lower:
+                raise ValueError("Benchmark bands must be contiguous")
+        
+        priority = {quality: rank for rank, quality in enumerate(BENCHMARK_QUALITIES)}
+        # Shared edges go to the upper band if it has priority, else to the lower one
+        upper_wins = {priority[upper] < priority[lower] for (lower, _), (upper, _) in zip(ordered, ordered[1:])}
+        if len(upper_wins) > 1:
+            raise ValueError("Benchmark bands must improve in one direction")
+        side = "right" if upper_wins == {True} or not upper_wins else "left"
+        # side="right" is bisect_right, side="left" is bisect_left
+        
+        lows = [band[0] for _, band in ordered]
+        high = ordered[-1][1][1]
+        if side == "right":
+            # [low, next low) bands; the top edge itself is still inside the last band
+            edges = lows + [float(np.nextafter(high, np.inf))]
         else:
-            return "Below poor range", 10
+            # (low, next low] bands; the bottom edge itself is still inside the first band
+            edges = [float(np.nextafter(lows[0], -np.inf))] + lows[1:] + [high]
+        
+        labels = (BELOW_RANGE[0],) + tuple(f"{quality.title()} range" for quality, _ in ordered) + (ABOVE_RANGE[0],)
+        scores = (BELOW_RANGE[1],) + tuple(QUALITY_SCORES[quality] for quality, _ in ordered) + (ABOVE_RANGE[1],)
+        return tuple(edges), side, labels, scores
+    
+    def _interpret_ratio(self, ratio_name: str, value: Any) -> Tuple[Any, Any]:
+        """
+        Interpret ratio value against benchmarks.
+        
+        Accepts a scalar, returning (label, score), or an array of values,
+        returning arrays of labels and scores.
+        """
+        table = self._edge_tbl.get(ratio_name)
+        if table is None:
+            return "No benchmark available", 50
+        
+        edges, side, labels, scores = table
+        # NaN is in no band and compares false with every edge, so it is placed
+        # below all bands explicitly (position 0) instead of wherever the search ends
+        if not isinstance(value, np.ndarray):
+            if np.isnan(value):
+                return BELOW_RANGE
+            idx = (bisect.bisect_right if side == "right" else bisect.bisect_left)(edges, value)
+            return labels[idx], scores[idx]
+        idx = np.searchsorted(edges, value, side=side)
+        idx[np.isnan(value)] = 0
+        return np.array(labels, dtype=object)[idx], np.array(scores)[idx]
     
     def _create_error_ratio(self, ratio_name: str, error_msg: str) -> RatioResult:
-        """Create error ratio result for failed calculations."""
-        return RatioResult(
-            name=ratio_name.replace("_", " ").title(),
-            value=0.0,
-            category=RatioCategory.RISK,
-            interpretation=f"Calculation error: {error_msg}",
-            benchmark_range=(0, 0),
-            quality_score=0,
-            warning_flags=[error_msg],
-            calculation_method="Error in calculation"
-        )
+        """Create error ratio result for failed calculations (shared, as results are immutable)."""
+        return _error_ratio(ratio_name, error_msg)
     
     def generate_ratio_summary(self, ratios: Dict[str, RatioResult]) -> Dict[str, Any]:
         """Generate summary of all calculated ratios."""
         
-        # Calculate overall financial health score
-        valid_ratios = [r for r in ratios.values() if r.quality_score > 0]
-        if valid_ratios:
-            overall_score = np.mean([r.quality_score for r in valid_ratios])
-        else:
-            overall_score = 0
-        
-        # Categorize ratios
-        categorized_ratios = {}
-        for category in RatioCategory:
-            categorized_ratios[category.value] = [
-                r for r in ratios.values() if r.category == category
-            ]
-        
-        # Collect all warnings
+        # Categorize ratios, collect warnings and score valid ratios in one pass
+        categorized_ratios = {category.value: [] for category in RatioCategory}
         all_warnings = []
+        valid_scores = []
         for ratio in ratios.values():
+            categorized_ratios[ratio.category.value].append(ratio)
             all_warnings.extend(ratio.warning_flags)
+            if ratio.quality_score > 0:
+                valid_scores.append(ratio.quality_score)
+        
+        # Calculate overall financial health score
+        overall_score = sum(valid_scores) / len(valid_scores) if valid_scores else 0
         
         # Determine overall financial health
         if overall_score >= 80:
@@ -723,9 +1080,9 @@ class FinancialRatioEngine:
             "overall_score": overall_score,
             "health_status": health_status,
             "total_ratios_calculated": len(ratios),
-            "valid_ratios": len(valid_ratios),
+            "valid_ratios": len(valid_scores),
             "categorized_ratios": categorized_ratios,
-            "key_warnings": list(set(all_warnings)),  # Remove duplicates
+            "key_warnings": list(dict.fromkeys(all_warnings)),  # Remove duplicates, keeping order
             "recommendations": self._generate_recommendations(ratios, overall_score)
         }
     
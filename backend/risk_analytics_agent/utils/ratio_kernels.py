@@ -0,0 +1,169 @@
+"""
+Numerical kernels for the core financial ratio and risk score arithmetic.
+Compiled with Numba when it is installed, plain Python otherwise.
+"""
+
+import logging
+import time
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op replacement for numba.njit when Numba is not installed."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+logger = logging.getLogger(__name__)
+
+# The kernels are not compiled with cache=True: Numba's on-disk cache records the
+# module name, and this file is imported both as risk_analytics_agent.utils.ratio_kernels
+# and as utils.ratio_kernels, so a cache written under one name fails to load under the other.
+# warm_up_kernels compiles them once per process instead, before the first request.
+_kernels_warm = False
+
+
+@njit
+def compute_key_ratios(annual_income: float, net_worth: float, monthly_contribution: float,
+                       liquid_assets: float, total_assets: float, total_debt: float,
+                       monthly_expenses: float) -> Tuple[float, float, float, float, float]:
+    """
+    Compute the key ratios used by the risk agent in a single pass.
+
+    Mirrors the formulas in FinancialRatioEngine; ratios that cannot be
+    calculated (missing income, expenses or assets) are reported as 0.0,
+    matching the value of an error RatioResult.
+
+    Returns:
+        Tuple of (savings_rate, liquidity_ratio, debt_to_asset,
+        debt_to_income, net_worth_to_income)
+    """
+    if annual_income > 0:
+        savings_rate = (monthly_contribution * 12 / annual_income) * 100
+        debt_to_income = (total_debt / annual_income) * 100
+        net_worth_to_income = net_worth / annual_income
+    else:
+        savings_rate = 0.0
+        debt_to_income = 0.0
+        net_worth_to_income = 0.0
+
+    if monthly_expenses > 0:
+        liquidity_ratio = liquid_assets / monthly_expenses
+    else:
+        liquidity_ratio = 0.0
+
+    if total_assets > 0:
+        debt_to_asset = (total_debt / total_assets) * 100
+    else:
+        debt_to_asset = 0.0
+
+    return savings_rate, liquidity_ratio, debt_to_asset, debt_to_income, net_worth_to_income
+
+
+@njit
+def compute_risk_score(age: float, time_horizon: float, risk_tolerance: float,
+                       savings_rate: float, liquidity_ratio: float, debt_to_asset: float,
+                       age_weight: float, horizon_weight: float,
+                       tolerance_weight: float, capacity_weight: float) -> float:
+    """
+    Compute the weighted quantitative risk score before clamping to 1-100.
+
+    Returns:
+        Unclamped weighted risk score
+    """
+    # Age factor (younger = higher risk capacity)
+    age_score = max(0.0, min(100.0, 100 - (age - 20) * 1.5))
+
+    # Time horizon factor
+    horizon_score = min(100.0, time_horizon * 4)
+
+    # Risk tolerance factor
+    tolerance_score = risk_tolerance * 10
+
+    # Financial capacity factor (based on ratios)
+    capacity_score = (
+        savings_rate * 1.5 +
+        min(50.0, liquidity_ratio * 10) +
+        max(0.0, 50 - debt_to_asset)
+    )
+
+    return (
+        age_score * age_weight +
+        horizon_score * horizon_weight +
+        tolerance_score * tolerance_weight +
+        capacity_score * capacity_weight
+    )
+
+
+@njit
+def required_monthly_contribution(current_value: float, target_amount: float,
+                                  months: float, monthly_return: float) -> float:
+    """
+    Monthly contribution needed to grow current_value to target_amount (PMT).
+
+    Returns:
+        Required monthly contribution, 0.0 when current_value alone suffices
+    """
+    if monthly_return > 0:
+        growth = (1 + monthly_return) ** months
+        # Future value of current investments
+        fv_current = current_value * growth
+        # Remaining amount needed from contributions
+        remaining_needed = target_amount - fv_current
+
+        if remaining_needed > 0:
+            return remaining_needed / ((growth - 1) / monthly_return)
+        return 0.0
+    return (target_amount - current_value) / months
+
+
+@njit(parallel=True)
+def required_monthly_contributions(current_value: np.ndarray, target_amount: np.ndarray,
+                                   months: np.ndarray, monthly_return: float) -> np.ndarray:
+    """
+    Vectorized required_monthly_contribution; rows without a horizon get 0.0.
+
+    Returns:
+        Array of required monthly contributions
+    """
+    n = current_value.shape[0]
+    required = np.zeros(n)
+    for i in prange(n):
+        if months[i] > 0:
+            required[i] = required_monthly_contribution(current_value[i], target_amount[i],
+                                                        months[i], monthly_return)
+    return required
+
+
+
+def warm_up_kernels() -> None:
+    """
+    Compile the kernels for the argument types the ratio engine and risk agent
+    pass (float64 scalars and arrays), so no request pays the JIT compilation.
+    Runs once per process; a no-op without Numba.
+    """
+    global _kernels_warm
+    if _kernels_warm or not NUMBA_AVAILABLE:
+        return
+
+    start = time.perf_counter()
+    compute_key_ratios(1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0)
+    compute_risk_score(1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0)
+    required_monthly_contribution(1.0, 1.0, 1.0, 0.01)
+    values = np.ones(1)
+    required_monthly_contributions(values, values, values, 0.01)
+    _kernels_warm = True
+    logger.debug("Compiled ratio kernels in %.2fs", time.perf_counter() - start)
+
+
+if not NUMBA_AVAILABLE:
+    logger.debug("Numba not installed - ratio kernels running as plain Python")
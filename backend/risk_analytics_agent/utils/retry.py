@@ -0,0 +1,59 @@
+"""
+Retry helper for outbound LLM calls.
+Retries only transient failures (timeouts, dropped connections, rate limits and
+5xx responses) with exponential backoff and full jitter.
+"""
+
+import asyncio
+import logging
+import random
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+
+logger = logging.getLogger(__name__)
+
+# HTTP status codes worth retrying: timeouts, rate limiting and server errors
+TRANSIENT_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Return True if the error is likely to succeed on a later attempt."""
+    if isinstance(error, (httpx.TimeoutException, httpx.NetworkError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None) in TRANSIENT_STATUS_CODES
+
+
+async def retry_async(operation: Callable[[], Awaitable[Any]],
+                      retries: int = 3,
+                      base_delay: float = 0.25,
+                      max_delay: float = 10.0,
+                      jitter: bool = True,
+                      retry_if: Callable[[BaseException], bool] = is_transient_error) -> Any:
+    """
+    Await ``operation()``, retrying transient failures with exponential backoff.
+
+    Args:
+        operation: Zero-argument callable returning a fresh awaitable per attempt
+        retries: Retries after the first attempt
+        base_delay: Backoff for the first retry in seconds, doubled per attempt
+        max_delay: Upper bound for a single backoff
+        jitter: Sleep a random fraction of the backoff (full jitter)
+        retry_if: Predicate deciding whether an error is retryable
+
+    Returns:
+        Result of the first successful attempt
+    """
+    for attempt in range(retries + 1):
+        try:
+            return await operation()
+        except Exception as e:
+            if attempt == retries or not retry_if(e):
+                raise
+            delay = min(max_delay, base_delay * (2 ** attempt))
+            if jitter:
+                delay = random.uniform(0, delay)
+            logger.warning("Transient error on attempt %s, retrying in %.2fs: %s", attempt + 1, delay, e)
+            await asyncio.sleep(delay)
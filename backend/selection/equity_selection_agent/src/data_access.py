@@ -9,6 +9,7 @@ Usage:
 """
 
 import os
+import time
 import pandas as pd
 import logging
 from typing import Optional, Tuple, List
@@ -63,13 +64,15 @@ class DataAccess:
     
     def get_price_data(self, 
                       tickers: Optional[List[str]] = None, 
-                      force_reload: bool = False) -> Optional[pd.DataFrame]:
+                      force_reload: bool = False,
+                      columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
         """
         Get historical price data.
         
         Args:
             tickers: List of specific tickers to get (None = all)
             force_reload: Force reload from database
+            columns: Columns to return (None = all)
             
         Returns:
             DataFrame with price data or None if not available
@@ -81,7 +84,9 @@ class DataAccess:
         
         # Use the StockDatabase method directly for specific tickers
         if tickers is not None:
-            return self.stock_db.get_price_data(tickers=tickers)
+            return self.stock_db.get_price_data(tickers=tickers, columns=columns)
+        elif columns and self._price_data_df is not None:
+            return self._price_data_df[list(columns)]
         else:
             return self._price_data_df
     
@@ -197,17 +202,34 @@ class DataAccess:
 _data_access = DataAccess(data_dir=os.path.join(os.path.dirname(os.path.dirname(__file__)), "data"))
 
 
+# Seconds a successful ensure_data_available check stays valid
+FRESHNESS_CHECK_TTL_SECONDS = 60.0
+
+# time.monotonic() of the last successful ensure_data_available check
+_last_successful_check: Optional[float] = None
+
+
 # Convenience functions for easy import and use
-def ensure_data_available(max_age_hours: int = 24) -> bool:
+def ensure_data_available(max_age_hours: int = 24, force: bool = False) -> bool:
     """
     Ensure that data is available, refreshing if necessary.
     
+    A successful check is reused for FRESHNESS_CHECK_TTL_SECONDS, so the data
+    getters called back to back do not each trigger a database update.
+    
     Args:
         max_age_hours: Maximum age in hours before refresh
+        force: Check (and refresh) even if a recent check succeeded
         
     Returns:
         True if data is available, False if there was an error
     """
+    global _last_successful_check
+    if (not force and _last_successful_check is not None and
+            time.monotonic() - _last_successful_check < FRESHNESS_CHECK_TTL_SECONDS):
+        return True
+    _last_successful_check = None
+    
     if not _data_access.is_data_available():
         logger.info("No data available, collecting fresh data...")
         try:
@@ -221,7 +243,10 @@ def ensure_data_available(max_age_hours: int = 24) -> bool:
     else:
         _data_access.refresh_data_if_needed(max_age_hours)
     
-    return _data_access.is_data_available()
+    available = _data_access.is_data_available()
+    if available:
+        _last_successful_check = time.monotonic()
+    return available
 
 
 def get_universe() -> Optional[pd.DataFrame]:
@@ -230,10 +255,11 @@ def get_universe() -> Optional[pd.DataFrame]:
     return _data_access.get_universe()
 
 
-def get_price_data(tickers: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
-    """Get historical price data."""
+def get_price_data(tickers: Optional[List[str]] = None,
+                   columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """Get historical price data, optionally restricted to the given columns."""
     ensure_data_available()
-    return _data_access.get_price_data(tickers)
+    return _data_access.get_price_data(tickers, columns=columns)
 
 
 def get_fundamental_data(tickers: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
@@ -17,19 +17,25 @@ import sys
 import os
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional, Dict, Any, TypedDict
+from typing import TYPE_CHECKING, List, Optional, Dict, Any, TypedDict
 
-# LangGraph imports
-from langgraph.graph import StateGraph, START, END
-from langgraph.graph.state import CompiledStateGraph
-
-from .config import Config, load_config_from_env
+from .config import Config, UniverseConfig, load_config_from_env
 from .data_access import ensure_data_available, get_universe, get_price_data, get_fundamental_data
-from .feature_engine import FundamentalCalculator, TechnicalAnalyzer, calculate_composite_features
+from .feature_engine import PRICE_COLUMNS, FundamentalCalculator, TechnicalAnalyzer, calculate_composite_features
 from .selector_logic import EquityScreener
 from .ranking_engine import RankingEngine
 
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+if TYPE_CHECKING:
+    from langgraph.graph.state import CompiledStateGraph
+
 # TODO: Add tackling for avoid industries
 # State definition for the workflow
 class EquitySelectionAgentState(TypedDict):
@@ -39,12 +45,13 @@ class EquitySelectionAgentState(TypedDict):
     regions: Optional[List[str]]
     sectors: Optional[List[str]]
     force_refresh: bool
+    keep_intermediates: bool  # Keep upstream data frames in the state (for debugging)
     start_time: float
     
     # Data objects - using Any to accommodate pandas DataFrames and Dicts
     universe_df: Optional[Any]  # pandas DataFrame
     price_data: Optional[Any]   # pandas DataFrame
-    fundamental_data: Optional[Any]  # Dict[str, Dict[str, Any]]
+    fundamental_data: Optional[Any]  # pandas DataFrame
     
     # Processing results - using Any for pandas DataFrames
     fundamental_features: Optional[Any]  # pandas DataFrame
@@ -65,6 +72,136 @@ class EquitySelectionAgentState(TypedDict):
     error: Optional[str]
 
 
+# Loaded data frames keyed by (loader, data version, tickers); see _load_cached
+_DATA_CACHE: Dict[tuple, Any] = {}
+
+
+def _data_version(config: Config) -> int:
+    """Index of the current price refresh period; cached data expires when it rolls over."""
+    universe_config = getattr(config, 'universe', None) or UniverseConfig()
+    period_seconds = max(universe_config.price_refresh_days, 1) * 86400
+    return int(time.time() // period_seconds)
+
+
+def _load_cached(loader, version: int, tickers: Optional[tuple] = None,
+                 columns: Optional[tuple] = None, prepare=None) -> Any:
+    """
+    Call a data loader, reusing its result from earlier workflow runs.
+    
+    Entries from older data versions are dropped when a new result is stored, and
+    empty results are not cached so a failed load is retried on the next run.
+    Cached data frames are shared between runs and must not be modified in place.
+    
+    Args:
+        loader: get_universe, get_price_data or get_fundamental_data
+        version: Data version from _data_version
+        tickers: Tickers to load (None for loaders without arguments)
+        columns: Columns to load (None for all)
+        prepare: Optional function applied to a non-empty result before it is cached
+        
+    Returns:
+        The loader's result
+    """
+    key = (loader, version, tickers, columns)
+    if key in _DATA_CACHE:
+        return _DATA_CACHE[key]
+    
+    if tickers is None:
+        result = loader()
+    elif columns is None:
+        result = loader(list(tickers))
+    else:
+        result = loader(list(tickers), columns=list(columns))
+    if result is not None and not result.empty:
+        if prepare is not None:
+            result = prepare(result)
+        for stale_key in [k for k in _DATA_CACHE if k[1] != version]:
+            del _DATA_CACHE[stale_key]
+        _DATA_CACHE[key] = result
+    return result
+
+
+def _ticker_dtype(frame: Any) -> Dict[str, str]:
+    """astype mapping storing the ticker column as Arrow strings when PyArrow is installed."""
+    if PYARROW_AVAILABLE and 'ticker' in frame.columns:
+        return {'ticker': 'string[pyarrow]'}
+    return {}
+
+
+def _prepare_universe(universe_df: Any) -> Any:
+    """Store the region and sector columns as categoricals so the filters compare integer codes."""
+    dtypes = {col: 'category' for col in ('region', 'sector') if col in universe_df.columns}
+    return universe_df.astype({**dtypes, **_ticker_dtype(universe_df)})
+
+
+def _prepare_fundamentals(fundamental_data: Any) -> Any:
+    """Store the fundamental data tickers as Arrow strings when available."""
+    return fundamental_data.astype(_ticker_dtype(fundamental_data))
+
+
+# Inputs and outputs of the feature engineering stage of the last failed run, so a
+# retry can skip it; see _feature_checkpoint. Dropped once a run succeeds.
+_FEATURE_CHECKPOINT: Optional[tuple] = None
+
+
+def _feature_checkpoint(state: EquitySelectionAgentState) -> tuple:
+    """
+    Describe the feature engineering inputs of a run.
+    
+    Returns:
+        Tuple of (key, input frames); the stored features are reused only when the key
+        is equal and the price and fundamental frames are the same (cached) objects
+    """
+    config = state["config"]
+    key = (
+        FundamentalCalculator, TechnicalAnalyzer, calculate_composite_features,
+        tuple(state["universe_df"]['ticker']),
+        repr(getattr(config, 'screening', None)), repr(getattr(config, 'technical', None))
+    )
+    return key, (state["price_data"], state["fundamental_data"])
+
+
+def _drop_feature_checkpoint() -> None:
+    """Release the feature frames held by the checkpoint."""
+    global _FEATURE_CHECKPOINT
+    _FEATURE_CHECKPOINT = None
+
+
+def _clear_caches() -> None:
+    """Drop the cached data frames and the feature checkpoint."""
+    _DATA_CACHE.clear()
+    _drop_feature_checkpoint()
+
+
+def _filter_by_values(frame: Any, column: str, values: List[str]) -> Any:
+    """
+    Rows of frame whose column value is one of values.
+    
+    A single value on a categorical column is matched by comparing category codes,
+    and a value that is not a category returns no rows without scanning the column.
+    """
+    column_values = frame[column]
+    if len(values) == 1 and column_values.dtype.name == 'category':
+        categories = column_values.cat.categories
+        if values[0] not in categories:
+            return frame.iloc[:0]
+        return frame[column_values.cat.codes.to_numpy() == categories.get_loc(values[0])]
+    return frame[column_values.isin(values)]
+
+
+def _prepare_prices(price_data: Any) -> Any:
+    """Store float64 price columns as float32; the indicator kernels compute in float64."""
+    dtypes = {col: 'float32' for col in price_data.select_dtypes('float64').columns}
+    return price_data.astype({**dtypes, **_ticker_dtype(price_data)})
+
+
+def _release_intermediates(state: EquitySelectionAgentState, *keys: str) -> None:
+    """Drop data frames no later node reads, unless the run keeps intermediates."""
+    if not state["keep_intermediates"]:
+        for key in keys:
+            state[key] = None
+
+
 def setup_logging(config: Config) -> None:
     """Set up logging configuration"""
     log_level = getattr(logging, config.output.log_level.upper(), logging.INFO)
@@ -100,9 +237,14 @@ def data_loading_node(state: EquitySelectionAgentState) -> EquitySelectionAgentS
         regions = state["regions"]
         sectors = state["sectors"]
         
+        if state["force_refresh"]:
+            _clear_caches()
+            ensure_data_available(force=True)
+        version = _data_version(state["config"])
+        
         # Load universe data
         logger.info("Loading universe data...")
-        universe_df = get_universe()
+        universe_df = _load_cached(get_universe, version, prepare=_prepare_universe)
         
         if universe_df is None or universe_df.empty:
             raise Exception("Failed to load universe data")
@@ -110,12 +252,12 @@ def data_loading_node(state: EquitySelectionAgentState) -> EquitySelectionAgentS
         # Filter by regions if specified
         if regions:
             logger.info(f"Filtering universe by regions: {regions}")
-            universe_df = universe_df[universe_df['region'].isin(regions)]
+            universe_df = _filter_by_values(universe_df, 'region', regions)
 
         # Filter by sectors if specified
         if sectors:
             logger.info(f"Filtering universe by sectors: {sectors}")
-            filtered_by_sector = universe_df[universe_df['sector'].isin(sectors)]
+            filtered_by_sector = _filter_by_values(universe_df, 'sector', sectors)
             if filtered_by_sector is None or filtered_by_sector.empty:
                 logger.info("No equities for the requested sectors.")
             else:
@@ -129,41 +271,33 @@ def data_loading_node(state: EquitySelectionAgentState) -> EquitySelectionAgentS
         
         # Load price data
         logger.info("Loading historical price data...")
-        price_data = get_price_data(tickers)
+        price_data = _load_cached(get_price_data, version, tuple(tickers), columns=PRICE_COLUMNS,
+                                  prepare=_prepare_prices)
         
         if price_data is None or price_data.empty:
             raise Exception("Failed to load price data")
         
         # Load fundamental data
         logger.info("Loading fundamental data...")
-        fundamental_data = get_fundamental_data(tickers)
+        fundamental_data = _load_cached(get_fundamental_data, version, tuple(tickers),
+                                        prepare=_prepare_fundamentals)
         
         if fundamental_data is None or fundamental_data.empty:
             raise Exception("Failed to load fundamental data")
         
-        # Convert fundamental data to dictionary format expected by feature engine
-        fundamental_data_dict = {}
-        for _, row in fundamental_data.iterrows():
-            ticker = row['ticker']
-            fundamental_data_dict[ticker] = row.to_dict()
-        
         # Update state
-        state.update({
-            "universe_df": universe_df,
-            "price_data": price_data,
-            "fundamental_data": fundamental_data_dict,
-            "initial_universe_size": initial_universe_size
-        })
+        state["universe_df"] = universe_df
+        state["price_data"] = price_data
+        state["fundamental_data"] = fundamental_data
+        state["initial_universe_size"] = initial_universe_size
         
         logger.info(f"Data loading completed successfully for {initial_universe_size} stocks")
         return state
         
     except Exception as e:
         logger.error(f"Data loading failed: {str(e)}")
-        state.update({
-            "success": False,
-            "error": f"Data loading failed: {str(e)}"
-        })
+        state["success"] = False
+        state["error"] = f"Data loading failed: {str(e)}"
         return state
 
 
@@ -192,43 +326,53 @@ def feature_engineering_node(state: EquitySelectionAgentState) -> EquitySelectio
         if fundamental_data is None:
             raise Exception("Fundamental data is None")
         
-        # Initialize calculators
-        fundamental_calculator = FundamentalCalculator(config)
-        technical_analyzer = TechnicalAnalyzer(config)
-        
-        # Calculate fundamental features
-        logger.info("Calculating fundamental metrics...")
-        fundamental_features = fundamental_calculator.process_fundamental_data(
-            fundamental_data, universe_df
-        )
-        
-        # Calculate technical features
-        logger.info("Calculating technical indicators...")
-        technical_features = technical_analyzer.process_technical_data(price_data)
-        
-        # Combine features
-        combined_features = calculate_composite_features(
-            fundamental_features, technical_features
-        )
+        # Reuse the features of a failed run with the same inputs (a retry after a
+        # later node failed); the data frames come from the load cache
+        global _FEATURE_CHECKPOINT
+        checkpoint_key, checkpoint_inputs = _feature_checkpoint(state)
+        if (_FEATURE_CHECKPOINT is not None and _FEATURE_CHECKPOINT[0] == checkpoint_key and
+                all(a is b for a, b in zip(_FEATURE_CHECKPOINT[1], checkpoint_inputs))):
+            logger.info("Reusing features from the previous run with the same inputs")
+            fundamental_features, technical_features, combined_features = _FEATURE_CHECKPOINT[2]
+        else:
+            # Initialize calculators
+            fundamental_calculator = FundamentalCalculator(config)
+            technical_analyzer = TechnicalAnalyzer(config)
+            
+            # Fundamental and technical features use disjoint inputs, so calculate
+            # them concurrently (the pandas/NumPy work releases the GIL)
+            logger.info("Calculating fundamental metrics and technical indicators...")
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                fundamental_future = executor.submit(
+                    fundamental_calculator.process_fundamental_data, fundamental_data, universe_df
+                )
+                technical_future = executor.submit(technical_analyzer.process_technical_data, price_data)
+                fundamental_features = fundamental_future.result()
+                technical_features = technical_future.result()
+            
+            # Combine features
+            combined_features = calculate_composite_features(
+                fundamental_features, technical_features
+            )
+            
+            _FEATURE_CHECKPOINT = (checkpoint_key, checkpoint_inputs,
+                                   (fundamental_features, technical_features, combined_features))
         
         logger.info(f"Combined features calculated for {len(combined_features)} stocks")
         
         # Update state
-        state.update({
-            "fundamental_features": fundamental_features,
-            "technical_features": technical_features,
-            "combined_features": combined_features
-        })
+        state["fundamental_features"] = fundamental_features
+        state["technical_features"] = technical_features
+        state["combined_features"] = combined_features
+        _release_intermediates(state, "universe_df", "price_data")
         
         logger.info("Feature engineering completed successfully")
         return state
         
     except Exception as e:
         logger.error(f"Feature engineering failed: {str(e)}")
-        state.update({
-            "success": False,
-            "error": f"Feature engineering failed: {str(e)}"
-        })
+        state["success"] = False
+        state["error"] = f"Feature engineering failed: {str(e)}"
         return state
 
 
@@ -274,20 +418,18 @@ def screening_node(state: EquitySelectionAgentState) -> EquitySelectionAgentStat
         screening_summary = screener.get_screening_summary()
         
         # Update state
-        state.update({
-            "screened_data": screened_data,
-            "screening_summary": screening_summary
-        })
+        state["screened_data"] = screened_data
+        state["screening_summary"] = screening_summary
+        _release_intermediates(state, "fundamental_data", "fundamental_features",
+                               "technical_features", "combined_features")
         
         logger.info("Screening completed successfully")
         return state
         
     except Exception as e:
         logger.error(f"Screening failed: {str(e)}")
-        state.update({
-            "success": False,
-            "error": f"Screening failed: {str(e)}"
-        })
+        state["success"] = False
+        state["error"] = f"Screening failed: {str(e)}"
         return state
 
 
@@ -331,13 +473,12 @@ def ranking_selection_node(state: EquitySelectionAgentState) -> EquitySelectionA
         execution_time = time.time() - start_time
         
         # Update state with final results
-        state.update({
-            "scored_data": scored_data,
-            "ranked_data": ranked_data,
-            "final_selections": final_selections,
-            "execution_time": execution_time,
-            "success": True
-        })
+        state["scored_data"] = scored_data
+        state["ranked_data"] = ranked_data
+        state["final_selections"] = final_selections
+        state["execution_time"] = execution_time
+        state["success"] = True
+        _release_intermediates(state, "screened_data")
         
         # Generate summary
         logger.info("\n" + "="*50)
@@ -349,13 +490,15 @@ def ranking_selection_node(state: EquitySelectionAgentState) -> EquitySelectionA
         logger.info(f"Success rate: {len(final_selections)/initial_universe_size*100:.1f}%")
         
         # Top 3 selections preview
-        if hasattr(final_selections, 'empty') and not final_selections.empty:
+        if final_selections is not None and not final_selections.empty:
             logger.info("\nTOP 3 SELECTIONS:")
             logger.info("-" * 40)
-            for i, (_, row) in enumerate(final_selections.head(3).iterrows(), 1):
-                score = row.get('final_score', 0)
-                ticker = row.get('ticker', 'Unknown')
-                sector = row.get('sector', 'Unknown')
+            top_selections = final_selections.head(3)
+            preview_columns = [
+                top_selections[column].tolist() if column in top_selections.columns else [default] * len(top_selections)
+                for column, default in (('ticker', 'Unknown'), ('sector', 'Unknown'), ('final_score', 0))
+            ]
+            for i, (ticker, sector, score) in enumerate(zip(*preview_columns), 1):
                 logger.info(f"{i}. {ticker} ({sector}) - Score: {score:.2f}")
         
         logger.info("\n" + "="*60)
@@ -367,11 +510,9 @@ def ranking_selection_node(state: EquitySelectionAgentState) -> EquitySelectionA
     except Exception as e:
         execution_time = time.time() - state["start_time"]
         logger.error(f"Ranking and selection failed: {str(e)}")
-        state.update({
-            "success": False,
-            "error": f"Ranking and selection failed: {str(e)}",
-            "execution_time": execution_time
-        })
+        state["success"] = False
+        state["error"] = f"Ranking and selection failed: {str(e)}"
+        state["execution_time"] = execution_time
         return state
 
 
@@ -379,13 +520,21 @@ def ranking_selection_node(state: EquitySelectionAgentState) -> EquitySelectionA
 # WORKFLOW CREATION AND EXECUTION
 # =============================================================================
 
-def create_workflow() -> CompiledStateGraph:
+def _route_after_node(state: EquitySelectionAgentState) -> str:
+    """Continue to the next node, or stop once a node has reported a failure."""
+    return "continue" if state["success"] else "stop"
+
+
+def create_workflow() -> "CompiledStateGraph":
     """
     Create and compile the LangGraph workflow for the Equity Selection Agent.
     
     Returns:
         Compiled StateGraph ready for execution
     """
+    # LangGraph is only needed to build the graph, so it is imported on first use
+    from langgraph.graph import StateGraph, START, END
+    
     # Create the state graph
     workflow = StateGraph(EquitySelectionAgentState)
     
@@ -395,21 +544,42 @@ def create_workflow() -> CompiledStateGraph:
     workflow.add_node("screening", screening_node)
     workflow.add_node("ranking_selection", ranking_selection_node)
     
-    # Add edges to define the flow
+    # Add edges to define the flow; a failed node ends the run
     workflow.add_edge(START, "data_loading")
-    workflow.add_edge("data_loading", "feature_engineering")
-    workflow.add_edge("feature_engineering", "screening")
-    workflow.add_edge("screening", "ranking_selection")
+    workflow.add_conditional_edges("data_loading", _route_after_node,
+                                   {"continue": "feature_engineering", "stop": END})
+    workflow.add_conditional_edges("feature_engineering", _route_after_node,
+                                   {"continue": "screening", "stop": END})
+    workflow.add_conditional_edges("screening", _route_after_node,
+                                   {"continue": "ranking_selection", "stop": END})
     workflow.add_edge("ranking_selection", END)
     
     # Compile the workflow
     return workflow.compile()
 
 
+# Compiled workflow shared by run_agent_workflow calls; see _compiled_workflow
+_COMPILED_WORKFLOW: Optional["CompiledStateGraph"] = None
+
+
+def _compiled_workflow() -> "CompiledStateGraph":
+    """
+    Return the compiled workflow, building it on first use.
+    
+    The graph holds no per-run data (all of it travels in the state passed to
+    invoke), so one compiled instance can serve every run.
+    """
+    global _COMPILED_WORKFLOW
+    if _COMPILED_WORKFLOW is None:
+        _COMPILED_WORKFLOW = create_workflow()
+    return _COMPILED_WORKFLOW
+
+
 def run_agent_workflow(regions: Optional[List[str]] = None,
                       sectors: Optional[List[str]] = None,
                       force_refresh: bool = False,
-                      config: Optional[Config] = None) -> Dict[str, Any]:
+                      config: Optional[Config] = None,
+                      keep_intermediates: bool = False) -> Dict[str, Any]:
     """
     Run the Equity Selection Agent using LangGraph workflow.
     
@@ -418,6 +588,8 @@ def run_agent_workflow(regions: Optional[List[str]] = None,
         sectors: List of allowed sectors
         force_refresh: Force refresh of cached data
         config: Configuration object (uses default if None)
+        keep_intermediates: Keep every node's data frames in the workflow state instead
+            of releasing them once no later node needs them
         
     Returns:
         Dictionary with execution results and file paths
@@ -437,8 +609,8 @@ def run_agent_workflow(regions: Optional[List[str]] = None,
     logger.info(f"Allowed sectors: {sectors or 'All'}")
     
     try:
-        # Create the workflow
-        workflow = create_workflow()
+        # Get the compiled workflow
+        workflow = _compiled_workflow()
         
         # Initialize the state
         initial_state: EquitySelectionAgentState = {
@@ -447,6 +619,7 @@ def run_agent_workflow(regions: Optional[List[str]] = None,
             "regions": regions,
             "sectors": sectors,
             "force_refresh": force_refresh,
+            "keep_intermediates": keep_intermediates,
             "start_time": start_time,
             
             # Data objects (initialized to None)
@@ -479,6 +652,8 @@ def run_agent_workflow(regions: Optional[List[str]] = None,
         
         # Extract results
         if final_state["success"]:
+            # The feature checkpoint only serves retries of failed runs
+            _drop_feature_checkpoint()
             return {
                 'success': True,
                 'execution_time': final_state["execution_time"],
@@ -490,9 +665,10 @@ def run_agent_workflow(regions: Optional[List[str]] = None,
                 'ranked_data': final_state["ranked_data"]
             }
         else:
+            # Runs that stop before ranking have no execution time recorded
             return {
                 'success': False,
-                'execution_time': final_state["execution_time"],
+                'execution_time': final_state["execution_time"] or time.time() - start_time,
                 'error': final_state["error"]
             }
         
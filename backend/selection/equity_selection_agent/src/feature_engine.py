@@ -12,13 +12,152 @@ Classes:
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Union
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op replacement for numba.njit when Numba is not installed."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
 
 from .config import Config
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Minimum price history for meaningful technical analysis
+MIN_PRICE_OBSERVATIONS = 50
+
+# Database price data columns read by TechnicalAnalyzer.process_technical_data
+PRICE_COLUMNS = ('ticker', 'date', 'close')
+
+# yfinance info keys used when a fundamental column is missing or zero
+INFO_FALLBACK_KEYS = {
+    'current_price': 'regularMarketPrice',
+    'trailing_eps': 'trailingEps',
+    'return_on_equity': 'returnOnEquity',
+    'debt_to_equity': 'debtToEquity',
+    'price_to_book': 'priceToBook',
+    'beta': 'beta',
+    'market_cap': 'marketCap'
+}
+
+
+# =============================================================================
+# COMPILED INDICATOR KERNELS
+# =============================================================================
+
+@njit(cache=True)
+def _ewm_mean(values: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Exponentially weighted mean, matching pandas ewm(alpha=..., adjust=False).mean()
+    including its NaN handling (leading NaNs stay NaN).
+    """
+    n = values.shape[0]
+    out = np.empty(n)
+    if n == 0:
+        return out
+    old_wt_factor = 1.0 - alpha
+    weighted = values[0]
+    out[0] = weighted
+    old_wt = 1.0
+    for i in range(1, n):
+        cur = values[i]
+        if weighted == weighted:
+            old_wt *= old_wt_factor
+            if cur == cur:
+                if weighted != cur:
+                    weighted = old_wt * weighted + alpha * cur
+                    weighted /= (old_wt + alpha)
+                old_wt = 1.0
+        elif cur == cur:
+            weighted = cur
+        out[i] = weighted
+    return out
+
+
+@njit(cache=True)
+def _last_rsi(close: np.ndarray, period: int) -> float:
+    """Latest RSI with Wilder's smoothing (see TechnicalAnalyzer.calculate_rsi)."""
+    n = close.shape[0]
+    gains = np.empty(n)
+    losses = np.empty(n)
+    gains[0] = np.nan
+    losses[0] = np.nan
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        gains[i] = delta if delta > 0 else 0.0
+        losses[i] = -delta if delta < 0 else 0.0
+    alpha = 1.0 / period
+    avg_gain = _ewm_mean(gains, alpha)[n - 1]
+    avg_loss = _ewm_mean(losses, alpha)[n - 1]
+    if avg_loss == 0:
+        return np.nan
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+@njit(cache=True)
+def _last_macd(close: np.ndarray, fast: int, slow: int, signal: int) -> Tuple[float, float, float]:
+    """Latest MACD line, signal line and histogram (see TechnicalAnalyzer.calculate_macd)."""
+    macd_line = _ewm_mean(close, 2.0 / (fast + 1)) - _ewm_mean(close, 2.0 / (slow + 1))
+    signal_line = _ewm_mean(macd_line, 2.0 / (signal + 1))
+    n = close.shape[0]
+    return macd_line[n - 1], signal_line[n - 1], macd_line[n - 1] - signal_line[n - 1]
+
+
+@njit(cache=True)
+def _last_sma(close: np.ndarray, window: int) -> float:
+    """Latest simple moving average, NaN without a full window."""
+    n = close.shape[0]
+    if n < window:
+        return np.nan
+    total = 0.0
+    for i in range(n - window, n):
+        total += close[i]
+    return total / window
+
+
+@njit(cache=True)
+def _technical_snapshot(close: np.ndarray, rsi_period: int, macd_fast: int, macd_slow: int,
+                        macd_signal: int, sma_short: int, sma_long: int) -> np.ndarray:
+    """
+    Latest indicator values for one price series.
+
+    Returns:
+        Array of (rsi, sma_short, sma_long, macd_line, macd_signal, macd_histogram)
+    """
+    snapshot = np.empty(6)
+    snapshot[0] = _last_rsi(close, rsi_period)
+    snapshot[1] = _last_sma(close, sma_short)
+    snapshot[2] = _last_sma(close, sma_long)
+    snapshot[3], snapshot[4], snapshot[5] = _last_macd(close, macd_fast, macd_slow, macd_signal)
+    return snapshot
+
+
+@njit(cache=True)
+def _technical_snapshots(close: np.ndarray, starts: np.ndarray, ends: np.ndarray, rsi_period: int,
+                         macd_fast: int, macd_slow: int, macd_signal: int,
+                         sma_short: int, sma_long: int) -> np.ndarray:
+    """
+    _technical_snapshot for many tickers whose price series are stored
+    back to back in close, ticker i spanning close[starts[i]:ends[i]].
+
+    Returns:
+        (n_tickers, 6) array of snapshots
+    """
+    n = starts.shape[0]
+    out = np.empty((n, 6))
+    for i in range(n):
+        out[i] = _technical_snapshot(close[starts[i]:ends[i]], rsi_period, macd_fast, macd_slow,
+                                     macd_signal, sma_short, sma_long)
+    return out
+
 
 class FundamentalCalculator:
     """
@@ -99,138 +238,182 @@ class FundamentalCalculator:
         return float((value - sector_mean) / sector_std)
     
     def process_fundamental_data(self, 
-                               fundamental_data: Dict[str, Dict[str, Any]], 
+                               fundamental_data: Union[pd.DataFrame, Dict[str, Dict[str, Any]]], 
                                universe_df: pd.DataFrame) -> pd.DataFrame:
         """
         Process fundamental data for all tickers and calculate metrics with Z-scores.
         
+        Accepts the fundamental data frame from the database or a dictionary of
+        per-ticker data (with an optional yfinance 'info' dict per ticker), which
+        is flattened into a frame and handed to process_fundamental_frame.
+        
         Args:
-            fundamental_data: Dictionary of fundamental data by ticker
+            fundamental_data: Fundamental data frame, or dictionary of fundamental data by ticker
             universe_df: DataFrame with ticker and sector information
             
         Returns:
             DataFrame with calculated fundamental metrics and Z-scores
         """
-        results = []
-        
-        # Create sector mapping
-        sector_mapping = dict(zip(universe_df['ticker'], universe_df['sector']))
+        if isinstance(fundamental_data, pd.DataFrame):
+            return self.process_fundamental_frame(fundamental_data, universe_df)
         
-        # First pass: Calculate raw metrics for all tickers
-        raw_metrics = {}
+        rows = []
         for ticker, data in fundamental_data.items():
             if 'error' in data:
                 continue
             
-            try:
-                # Extract key data points
-                info = data.get('info', {})
-                balance_sheet = data.get('balance_sheet', {})
-                income_statement = data.get('income_statement', {})
-                
-                # Current price and EPS
-                current_price = data.get('current_price') or info.get('regularMarketPrice')
-                trailing_eps = data.get('trailing_eps') or info.get('trailingEps')
-                
-                # Get pre-calculated metrics from database (since we don't have full financial statements)
-                roe = data.get('return_on_equity') or info.get('returnOnEquity')
-                debt_to_equity = data.get('debt_to_equity') or info.get('debtToEquity')
-                price_to_book = data.get('price_to_book') or info.get('priceToBook')
-                
-                # Calculate P/E ratio
-                pe_ratio = self.calculate_pe_ratio(current_price, trailing_eps)
-                
-                # Debug: Log fundamental data for first few tickers
-                if len(raw_metrics) < 3:
-                    logger.info(f"Ticker {ticker}: roe={roe}, debt_to_equity={debt_to_equity}, "
-                               f"price_to_book={price_to_book}")
-                
-                # Get other useful metrics from yfinance
-                beta = data.get('beta') or info.get('beta')
-                market_cap = data.get('market_cap') or info.get('marketCap')
-                
-                metrics = {
-                    'ticker': ticker,
-                    'sector': sector_mapping.get(ticker, 'Unknown'),
-                    'current_price': current_price,
-                    'market_cap': market_cap,
-                    'pe_ratio': pe_ratio,
-                    'roe': roe,
-                    'debt_to_equity': debt_to_equity,
-                    'price_to_book': price_to_book,
-                    'beta': beta,
-                    'trailing_eps': trailing_eps
-                }
-                
-                raw_metrics[ticker] = metrics
-                
-            except Exception as e:
-                logger.warning(f"Error processing fundamental data for {ticker}: {e}")
-                continue
+            info = data.get('info', {})
+            row = {'ticker': ticker}
+            for column, info_key in INFO_FALLBACK_KEYS.items():
+                row[column] = data.get(column) or info.get(info_key)
+            rows.append(row)
+        
+        return self.process_fundamental_frame(
+            pd.DataFrame(rows, columns=['ticker', *INFO_FALLBACK_KEYS]), universe_df
+        )
+    
+    def process_fundamental_frame(self, 
+                                  fundamental_df: pd.DataFrame, 
+                                  universe_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calculate fundamental metrics and sector Z-scores for a fundamental data frame.
         
-        # Second pass: Calculate sector Z-scores
-        sectors = set(m['sector'] for m in raw_metrics.values() if m['sector'] != 'Unknown')
+        All metrics are computed as column expressions. Zero or missing inputs are
+        treated as unavailable, and the sector Z-scores follow calculate_sector_zscore
+        (population standard deviation, at least two peers with values).
         
-        for sector in sectors:
-            sector_tickers = [t for t, m in raw_metrics.items() if m['sector'] == sector]
-            
-            if len(sector_tickers) < 2:
-                continue
-            
-            # Collect sector values for P/E and D/E ratios
-            sector_pe_values = [raw_metrics[t]['pe_ratio'] for t in sector_tickers 
-                              if raw_metrics[t]['pe_ratio'] is not None]
-            sector_de_values = [raw_metrics[t]['debt_to_equity'] for t in sector_tickers 
-                              if raw_metrics[t]['debt_to_equity'] is not None]
+        Args:
+            fundamental_df: DataFrame with one row per ticker and the database fundamental columns
+            universe_df: DataFrame with ticker and sector information
             
-            # Calculate Z-scores for each ticker in the sector
-            for ticker in sector_tickers:
-                metrics = raw_metrics[ticker]
-                
-                # P/E Z-score (lower is better for value)
-                if metrics['pe_ratio'] is not None:
-                    pe_zscore = self.calculate_sector_zscore(metrics['pe_ratio'], sector_pe_values)
-                    metrics['pe_zscore'] = pe_zscore
-                else:
-                    metrics['pe_zscore'] = None
-                
-                # D/E Z-score (lower is better for safety)
-                if metrics['debt_to_equity'] is not None:
-                    de_zscore = self.calculate_sector_zscore(metrics['debt_to_equity'], sector_de_values)
-                    metrics['de_zscore'] = de_zscore
-                else:
-                    metrics['de_zscore'] = None
+        Returns:
+            DataFrame with calculated fundamental metrics and Z-scores
+        """
+        if fundamental_df.empty:
+            logger.info("Processed fundamental data for 0 tickers")
+            return pd.DataFrame()
         
-        # Convert to DataFrame
-        results_df = pd.DataFrame(list(raw_metrics.values()))
+        frame = fundamental_df.drop_duplicates(subset='ticker', keep='last').reset_index(drop=True)
+        tickers = frame['ticker']
         
-        # Add quality flags
-        if not results_df.empty:
-            results_df['meets_roe_threshold'] = (
-                (results_df['roe'].notna()) & 
-                (results_df['roe'] >= self.config.screening.min_roe)
-            )
-            
-            results_df['meets_de_threshold'] = (
-                (results_df['debt_to_equity'].notna()) & 
-                (results_df['debt_to_equity'] <= self.config.screening.max_debt_equity_absolute)
-            )
-            
-            results_df['meets_pe_threshold'] = (
-                (results_df['pe_ratio'].notna()) & 
-                (results_df['pe_ratio'] <= self.config.screening.max_pe_absolute) &
-                (results_df['pe_ratio'] > 0)
-            )
-            
-            results_df['meets_beta_threshold'] = (
-                (results_df['beta'].notna()) & 
-                (results_df['beta'] <= self.config.screening.max_beta)
+        # Sector of each ticker, 'Unknown' when it is not in the universe
+        sector_mapping = dict(zip(universe_df['ticker'], universe_df['sector']))
+        sector = tickers.map(sector_mapping).where(tickers.isin(list(sector_mapping)), 'Unknown')
+        
+        current_price, price_missing = _available_column(frame, 'current_price')
+        trailing_eps, eps_missing = _available_column(frame, 'trailing_eps')
+        roe, _ = _available_column(frame, 'return_on_equity')
+        debt_to_equity, de_missing = _available_column(frame, 'debt_to_equity')
+        price_to_book, _ = _available_column(frame, 'price_to_book')
+        beta, _ = _available_column(frame, 'beta')
+        market_cap, _ = _available_column(frame, 'market_cap')
+        
+        # P/E ratio (see calculate_pe_ratio)
+        price_values = pd.to_numeric(current_price, errors='coerce')
+        eps_values = pd.to_numeric(trailing_eps, errors='coerce')
+        pe_available = ~(price_missing | eps_missing | (price_values <= 0) | (eps_values <= 0))
+        pe_ratio = (price_values / eps_values).where(pe_available)
+        
+        # Debug: Log fundamental data for first few tickers
+        for i in range(min(3, len(frame))):
+            logger.info(f"Ticker {tickers[i]}: roe={roe[i]}, debt_to_equity={debt_to_equity[i]}, "
+                       f"price_to_book={price_to_book[i]}")
+        
+        results_df = pd.DataFrame({
+            'ticker': tickers,
+            'sector': sector,
+            'current_price': current_price,
+            'market_cap': market_cap,
+            'pe_ratio': pe_ratio,
+            'roe': roe,
+            'debt_to_equity': debt_to_equity,
+            'price_to_book': price_to_book,
+            'beta': beta,
+            'trailing_eps': trailing_eps
+        })
+        
+        # Sector Z-scores for known sectors with at least two tickers
+        in_scored_sector = (sector != 'Unknown') & (sector.groupby(sector).transform('size') >= 2)
+        if in_scored_sector.any():
+            results_df['pe_zscore'] = _sector_zscores(pe_ratio, pe_available & in_scored_sector, sector)
+            results_df['de_zscore'] = _sector_zscores(
+                pd.to_numeric(debt_to_equity, errors='coerce'), ~de_missing & in_scored_sector, sector
             )
         
+        # Add quality flags
+        results_df['meets_roe_threshold'] = (
+            (results_df['roe'].notna()) & 
+            (results_df['roe'] >= self.config.screening.min_roe)
+        )
+        
+        results_df['meets_de_threshold'] = (
+            (results_df['debt_to_equity'].notna()) & 
+            (results_df['debt_to_equity'] <= self.config.screening.max_debt_equity_absolute)
+        )
+        
+        results_df['meets_pe_threshold'] = (
+            (results_df['pe_ratio'].notna()) & 
+            (results_df['pe_ratio'] <= self.config.screening.max_pe_absolute) &
+            (results_df['pe_ratio'] > 0)
+        )
+        
+        results_df['meets_beta_threshold'] = (
+            (results_df['beta'].notna()) & 
+            (results_df['beta'] <= self.config.screening.max_beta)
+        )
+        
         logger.info(f"Processed fundamental data for {len(results_df)} tickers")
         return results_df
 
 
+def _reported_price(value: float, dtype: np.dtype) -> float:
+    """
+    A closing price as reported in the features. Closes stored as float32 are read
+    back as the shortest decimal float32 represents (123.45, not 123.4499969...).
+    """
+    if dtype == np.float32:
+        return float(str(np.float32(value)))
+    return float(value)
+
+
+def _available_column(frame: pd.DataFrame, column: str) -> Tuple[pd.Series, pd.Series]:
+    """
+    Values of a fundamental column with zeros treated as unavailable.
+    
+    Returns:
+        Tuple of (values with unavailable entries as missing, mask of unavailable entries)
+    """
+    if column not in frame.columns:
+        return pd.Series(None, index=frame.index, dtype=object), pd.Series(True, index=frame.index)
+    
+    values = frame[column]
+    missing = values == 0
+    if values.dtype == object:
+        missing |= values.isna()
+    return values.where(~missing), missing
+
+
+def _sector_zscores(values: pd.Series, scored: pd.Series, sector: pd.Series) -> pd.Series:
+    """
+    Sector Z-scores of values, vectorized FundamentalCalculator.calculate_sector_zscore.
+    
+    Args:
+        values: Numeric values per ticker
+        scored: Mask of tickers that get a Z-score (and whose values form the sector sample)
+        sector: Sector per ticker
+        
+    Returns:
+        Z-scores, NaN where no Z-score can be calculated
+    """
+    groups = values.where(scored).groupby(sector)
+    count = groups.transform('count')
+    mean = groups.transform('mean')
+    std = groups.transform('std', ddof=0)
+    
+    zscores = ((values - mean) / std).where(std != 0, 0.0)
+    return zscores.where(scored & (count >= 2))
+
+
 class TechnicalAnalyzer:
     """
     Calculates technical indicators using pandas-ta library for momentum and volatility analysis.
@@ -388,6 +571,10 @@ class TechnicalAnalyzer:
         """
         Process technical indicators for all tickers in the price data.
         
+        Indicator values come from the compiled kernels, which give the latest
+        values of the calculate_* indicators; database-format data is processed
+        for all tickers in one compiled call.
+        
         Args:
             price_data: DataFrame with price data (from database or yfinance)
             market_data: Market index data for beta calculation (optional)
@@ -402,95 +589,40 @@ class TechnicalAnalyzer:
         
         # Check if this is database format (has 'ticker' column) or yfinance format
         if 'ticker' in price_data.columns:
-            # Database format: convert to wide format for technical analysis
-            tickers = price_data['ticker'].unique()
+            # Database format: lay out each ticker's date-sorted closes back to back
+            codes, tickers = pd.factorize(price_data['ticker'])
+            row_counts = np.bincount(codes, minlength=len(tickers))
             
-            for ticker in tickers:
+            ordered = price_data.assign(_code=codes).sort_values(['_code', 'date'], kind='stable')
+            ordered = ordered[ordered['close'].notna()]
+            close_dtype = ordered['close'].dtype
+            close = ordered['close'].to_numpy(dtype=np.float64)
+            dates = ordered['date'].to_numpy()
+            ends = np.cumsum(np.bincount(ordered['_code'].to_numpy(), minlength=len(tickers)))
+            starts = ends - np.diff(ends, prepend=0)
+            
+            eligible = []
+            for i, ticker in enumerate(tickers):
+                if row_counts[i] < MIN_PRICE_OBSERVATIONS:  # Need minimum data for meaningful analysis
+                    logger.warning(f"Insufficient data for {ticker}")
+                elif ends[i] - starts[i] < MIN_PRICE_OBSERVATIONS:
+                    logger.warning(f"Insufficient closing price data for {ticker}")
+                else:
+                    eligible.append(i)
+            
+            eligible = np.array(eligible, dtype=np.int64)
+            snapshots = _technical_snapshots(close, starts[eligible], ends[eligible], *self._indicator_parameters())
+            
+            for i, snapshot in zip(eligible.tolist(), snapshots):
+                ticker = tickers[i]
                 try:
-                    # Filter data for this ticker
-                    ticker_data = price_data[price_data['ticker'] == ticker].copy()
-                    
-                    if len(ticker_data) < 50:  # Need minimum data for meaningful analysis
-                        logger.warning(f"Insufficient data for {ticker}")
-                        continue
-                    
-                    # Sort by date and set as index
-                    ticker_data = ticker_data.sort_values('date').set_index('date')
-                    
-                    # Get closing prices
-                    close_prices = ticker_data['close'].dropna()
-                    
-                    if len(close_prices) < 50:
-                        logger.warning(f"Insufficient closing price data for {ticker}")
-                        continue
-                    
-                    # Calculate technical indicators
-                    rsi = self.calculate_rsi(close_prices, self.config.technical.rsi_period)
-                    
-                    # MACD
-                    macd_data = self.calculate_macd(
-                        close_prices, 
-                        self.config.technical.macd_fast,
-                        self.config.technical.macd_slow,
-                        self.config.technical.macd_signal
-                    )
-                    
-                    # Bollinger Bands
-                    bb_data = self.calculate_bollinger_bands(
-                        close_prices,
-                        self.config.technical.bb_period,
-                        self.config.technical.bb_std
-                    )
-                    
-                    # Simple Moving Averages
-                    sma_50 = self.calculate_sma(close_prices, self.config.technical.sma_short)
-                    sma_200 = self.calculate_sma(close_prices, self.config.technical.sma_long)
-                    
-                    # Get current (latest) values
-                    current_price = close_prices.iloc[-1]
-                    current_rsi = rsi.iloc[-1] if not rsi.empty else None
-                    current_sma_50 = sma_50.iloc[-1] if not sma_50.empty else None
-                    current_sma_200 = sma_200.iloc[-1] if not sma_200.empty else None
-                    
-                    # MACD signals
-                    macd_columns = list(macd_data.columns)
-                    macd_line = macd_data[macd_columns[0]].iloc[-1] if len(macd_columns) > 0 else None
-                    macd_signal = macd_data[macd_columns[1]].iloc[-1] if len(macd_columns) > 1 else None
-                    macd_histogram = macd_data[macd_columns[2]].iloc[-1] if len(macd_columns) > 2 else None
-                    
-                    # Calculate beta if market data available
                     beta = None
                     if market_data is not None and not market_data.empty:
-                        market_close = market_data['Close'] if 'Close' in market_data.columns else market_data.iloc[:, 0]
-                        beta = self.calculate_beta(close_prices, market_close)
-                    
-                    # Technical signals
-                    price_above_sma50 = current_sma_50 is not None and current_price > current_sma_50
-                    price_above_sma200 = current_sma_200 is not None and current_price > current_sma_200
-                    macd_bullish = (macd_line is not None and macd_signal is not None and 
-                                   macd_line > macd_signal)
-                    rsi_overbought = current_rsi is not None and current_rsi > self.config.screening.max_rsi_overbought
-                    
-                    # Compile results
-                    technical_metrics = {
-                        'ticker': ticker,
-                        'current_price': current_price,
-                        'rsi': current_rsi,
-                        'sma_50': current_sma_50,
-                        'sma_200': current_sma_200,
-                        'macd_line': macd_line,
-                        'macd_signal': macd_signal,
-                        'macd_histogram': macd_histogram,
-                        'beta': beta,
-                        'price_above_sma50': price_above_sma50,
-                        'price_above_sma200': price_above_sma200,
-                        'macd_bullish': macd_bullish,
-                        'rsi_overbought': rsi_overbought,
-                        'positive_trend': price_above_sma50 or macd_bullish,
-                        'meets_rsi_threshold': not rsi_overbought if current_rsi is not None else True
-                    }
+                        close_prices = pd.Series(close[starts[i]:ends[i]], index=dates[starts[i]:ends[i]])
+                        beta = self._market_beta(close_prices, market_data)
                     
-                    results.append(technical_metrics)
+                    current_price = _reported_price(close[ends[i] - 1], close_dtype)
+                    results.append(self._technical_metrics(ticker, current_price, snapshot, beta))
                     
                 except Exception as e:
                     logger.error(f"Error processing technical data for {ticker}: {e}")
@@ -517,85 +649,71 @@ class TechnicalAnalyzer:
                     # Get closing prices
                     close_prices = ticker_data['Close'].dropna()
                     
-                    if len(close_prices) < 50:  # Need minimum data for meaningful analysis
+                    if len(close_prices) < MIN_PRICE_OBSERVATIONS:  # Need minimum data for meaningful analysis
                         logger.warning(f"Insufficient data for {ticker}")
                         continue
                     
-                    # Calculate technical indicators
-                    rsi = self.calculate_rsi(close_prices, self.config.technical.rsi_period)
-                    
-                    # MACD
-                    macd_data = self.calculate_macd(
-                        close_prices, 
-                        self.config.technical.macd_fast,
-                        self.config.technical.macd_slow,
-                        self.config.technical.macd_signal
-                    )
-                    
-                    # Bollinger Bands
-                    bb_data = self.calculate_bollinger_bands(
-                        close_prices,
-                        self.config.technical.bb_period,
-                        self.config.technical.bb_std
-                    )
-                    
-                    # Simple Moving Averages
-                    sma_50 = self.calculate_sma(close_prices, self.config.technical.sma_short)
-                    sma_200 = self.calculate_sma(close_prices, self.config.technical.sma_long)
-                    
-                    # Get current (latest) values
-                    current_price = close_prices.iloc[-1]
-                    current_rsi = rsi.iloc[-1] if not rsi.empty else None
-                    current_sma_50 = sma_50.iloc[-1] if not sma_50.empty else None
-                    current_sma_200 = sma_200.iloc[-1] if not sma_200.empty else None
-                    
-                    # MACD signals
-                    macd_columns = list(macd_data.columns)
-                    macd_line = macd_data[macd_columns[0]].iloc[-1] if len(macd_columns) > 0 else None
-                    macd_signal = macd_data[macd_columns[1]].iloc[-1] if len(macd_columns) > 1 else None
-                    macd_histogram = macd_data[macd_columns[2]].iloc[-1] if len(macd_columns) > 2 else None
+                    close_values = close_prices.to_numpy(dtype=np.float64)
+                    snapshot = _technical_snapshot(close_values, *self._indicator_parameters())
                     
                     # Calculate beta if market data available
                     beta = None
                     if market_data is not None and not market_data.empty:
-                        market_close = market_data['Close'] if 'Close' in market_data.columns else market_data.iloc[:, 0]
-                        beta = self.calculate_beta(close_prices, market_close)
-                    
-                    # Technical signals
-                    price_above_sma50 = current_sma_50 is not None and current_price > current_sma_50
-                    price_above_sma200 = current_sma_200 is not None and current_price > current_sma_200
-                    macd_bullish = (macd_line is not None and macd_signal is not None and 
-                                   macd_line > macd_signal)
-                    rsi_overbought = current_rsi is not None and current_rsi > self.config.screening.max_rsi_overbought
-                    
-                    # Compile results
-                    technical_metrics = {
-                        'ticker': ticker,
-                        'current_price': current_price,
-                        'rsi': current_rsi,
-                        'sma_50': current_sma_50,
-                        'sma_200': current_sma_200,
-                        'macd_line': macd_line,
-                        'macd_signal': macd_signal,
-                        'macd_histogram': macd_histogram,
-                        'beta': beta,
-                        'price_above_sma50': price_above_sma50,
-                        'price_above_sma200': price_above_sma200,
-                        'macd_bullish': macd_bullish,
-                        'rsi_overbought': rsi_overbought,
-                        'positive_trend': price_above_sma50 or macd_bullish,
-                        'meets_rsi_threshold': not rsi_overbought if current_rsi is not None else True
-                    }
+                        beta = self._market_beta(close_prices, market_data)
                     
-                    results.append(technical_metrics)
+                    current_price = _reported_price(close_values[-1], close_prices.dtype)
+                    results.append(self._technical_metrics(ticker, current_price, snapshot, beta))
                     
                 except Exception as e:
                     logger.error(f"Error processing technical data for {ticker}: {e}")
                     continue
         
         results_df = pd.DataFrame(results)
+        if not results_df.empty and 'ticker' in price_data.columns:
+            # Keep the ticker dtype of the price data (e.g. Arrow strings) for the feature merge
+            results_df['ticker'] = results_df['ticker'].astype(price_data['ticker'].dtype)
         logger.info(f"Processed technical data for {len(results_df)} tickers")
         return results_df
+    
+    def _indicator_parameters(self) -> Tuple[int, ...]:
+        """Indicator periods in _technical_snapshot argument order."""
+        technical = self.config.technical
+        return (technical.rsi_period, technical.macd_fast, technical.macd_slow, technical.macd_signal,
+                technical.sma_short, technical.sma_long)
+    
+    def _market_beta(self, close_prices: pd.Series, market_data: pd.DataFrame) -> Optional[float]:
+        """Beta of a ticker's closing prices against the market index data."""
+        market_close = market_data['Close'] if 'Close' in market_data.columns else market_data.iloc[:, 0]
+        return self.calculate_beta(close_prices, market_close)
+    
+    def _technical_metrics(self, ticker: str, current_price: float, snapshot: np.ndarray,
+                           beta: Optional[float]) -> Dict[str, Any]:
+        """Technical metrics and signals for a ticker from its indicator snapshot."""
+        current_rsi, current_sma_50, current_sma_200, macd_line, macd_signal, macd_histogram = snapshot
+        
+        # Technical signals (comparisons with NaN indicators are False)
+        price_above_sma50 = current_price > current_sma_50
+        price_above_sma200 = current_price > current_sma_200
+        macd_bullish = macd_line > macd_signal
+        rsi_overbought = current_rsi > self.config.screening.max_rsi_overbought
+        
+        return {
+            'ticker': ticker,
+            'current_price': current_price,
+            'rsi': current_rsi,
+            'sma_50': current_sma_50,
+            'sma_200': current_sma_200,
+            'macd_line': macd_line,
+            'macd_signal': macd_signal,
+            'macd_histogram': macd_histogram,
+            'beta': beta,
+            'price_above_sma50': price_above_sma50,
+            'price_above_sma200': price_above_sma200,
+            'macd_bullish': macd_bullish,
+            'rsi_overbought': rsi_overbought,
+            'positive_trend': price_above_sma50 or macd_bullish,
+            'meets_rsi_threshold': not rsi_overbought
+        }
 
 
 def calculate_composite_features(fundamental_df: pd.DataFrame, 
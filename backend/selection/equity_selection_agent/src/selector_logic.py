@@ -420,13 +420,14 @@ class EquityScreener:
         self.qualitative_agent.enable_qualitative_analysis(enable)
     
     def add_qualitative_scores(self, data: pd.DataFrame, 
-                             fundamental_data: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+                             fundamental_data: Union[pd.DataFrame, Dict[str, Dict[str, Any]]]) -> pd.DataFrame:
         """
         Add qualitative scores to the screened data.
         
         Args:
             data: Screened DataFrame
-            fundamental_data: Original fundamental data with business summaries
+            fundamental_data: Original fundamental data with business summaries, as a
+                DataFrame or a dictionary by ticker
             
         Returns:
             DataFrame with qualitative scores added
@@ -442,16 +443,29 @@ class EquityScreener:
             data['qual_score'] = self.config.weights.w_qualitative * 0  # Zero weight if disabled
             return data
         
-        # Prepare data for qualitative analysis
+        # Business summary by ticker
+        if isinstance(fundamental_data, pd.DataFrame):
+            if 'business_summary' in fundamental_data.columns:
+                business_summaries = dict(zip(fundamental_data['ticker'].tolist(),
+                                              fundamental_data['business_summary'].tolist()))
+            else:
+                business_summaries = dict.fromkeys(fundamental_data['ticker'].tolist(), '')
+        else:
+            business_summaries = {ticker: values.get('business_summary', '')
+                                  for ticker, values in fundamental_data.items()}
+        
+        # Prepare data for qualitative analysis (tickers and records are materialized in one pass each)
+        tickers = data['ticker'].tolist()
+        metric_columns = [col for col in ('roe', 'debt_to_equity', 'pe_ratio') if col in data.columns]
+        records = data[metric_columns].to_dict(orient='records') if metric_columns else [{}] * len(data)
         companies_for_analysis = {}
-        for _, row in data.iterrows():
-            ticker = row['ticker']
-            if ticker in fundamental_data:
+        for ticker, record in zip(tickers, records):
+            if ticker in business_summaries:
                 companies_for_analysis[ticker] = {
-                    'news': fundamental_data[ticker].get('business_summary', ''),  # Changed from 'business_summary' to 'news'
-                    'roe': row.get('roe'),
-                    'debt_to_equity': row.get('debt_to_equity'),
-                    'pe_ratio': row.get('pe_ratio')
+                    'news': business_summaries[ticker],  # Changed from 'business_summary' to 'news'
+                    'roe': record.get('roe'),
+                    'debt_to_equity': record.get('debt_to_equity'),
+                    'pe_ratio': record.get('pe_ratio')
                 }
         
         logger.info(f"Prepared {len(companies_for_analysis)} companies for qualitative analysis")
@@ -467,8 +481,9 @@ class EquityScreener:
         data['qual_confidence'] = 0.5
         data['qual_assessment'] = 'Not analyzed'
         
+        ticker_values = data['ticker'].to_numpy()
         for ticker, qual_result in qual_scores.items():
-            mask = data['ticker'] == ticker
+            mask = ticker_values == ticker
             data.loc[mask, 'qual_score'] = qual_result.qual_score
             data.loc[mask, 'qual_confidence'] = qual_result.confidence or 0.5
             data.loc[mask, 'qual_assessment'] = qual_result.overall_assessment or 'Analyzed'
@@ -40,6 +40,10 @@ from .stock_universe import TickerManager, StockDataFetcher
 
 logger = logging.getLogger(__name__)
 
+# Columns of the price_data table that get_price_data can select
+PRICE_DATA_COLUMNS = ('ticker', 'date', 'open', 'high', 'low', 'close', 'volume',
+                      'dividends', 'stock_splits', 'fetch_date')
+
 
 class StockDatabase:
     """
@@ -395,7 +399,8 @@ class StockDatabase:
     def get_price_data(self, 
                       tickers: Optional[List[str]] = None,
                       start_date: Optional[str] = None,
-                      end_date: Optional[str] = None) -> pd.DataFrame:
+                      end_date: Optional[str] = None,
+                      columns: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Get price data with optional filtering.
         
@@ -403,12 +408,21 @@ class StockDatabase:
             tickers: List of tickers to filter by
             start_date: Start date (YYYY-MM-DD)
             end_date: End date (YYYY-MM-DD)
+            columns: Columns to select (None = all)
             
         Returns:
             DataFrame with price data
         """
+        if columns:
+            unknown = set(columns) - set(PRICE_DATA_COLUMNS)
+            if unknown:
+                raise ValueError(f"Unknown price data columns: {sorted(unknown)}")
+            select = ', '.join(columns)
+        else:
+            select = '*'
+        
         with sqlite3.connect(self.db_path) as conn:
-            query = "SELECT * FROM price_data WHERE 1=1"
+            query = f"SELECT {select} FROM price_data WHERE 1=1"
             params = []
             
             if tickers:
@@ -427,7 +441,7 @@ class StockDatabase:
             query += " ORDER BY ticker, date"
             
             df = pd.read_sql(query, conn, params=params)
-            if not df.empty:
+            if not df.empty and 'date' in df.columns:
                 df['date'] = pd.to_datetime(df['date'])
                 
             return df
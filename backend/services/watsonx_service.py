@@ -477,6 +477,7 @@ Given the {time_horizon}-year time horizon and financial goals, the required ris
 
 # Global service instance
 _watsonx_service: Optional[WatsonxService] = None
+_watsonx_service_lock = asyncio.Lock()
 
 
 def get_watsonx_service() -> WatsonxService:
@@ -487,17 +488,38 @@ def get_watsonx_service() -> WatsonxService:
     return _watsonx_service
 
 
-async def initialize_watsonx_service(model_id: str = "ibm/granite-3-2-8b-instruct") -> WatsonxService:
-    """Initialize and health check Watsonx service"""
-    service = WatsonxService(model_id=model_id)
+async def initialize_watsonx_service(model_id: str = "ibm/granite-3-2-8b-instruct",
+                                     force: bool = False) -> WatsonxService:
+    """
+    Initialize and health check Watsonx service.
     
-    # Perform initial health check
-    is_healthy = await service.health_check()
-    if is_healthy:
-        logger.info("Watsonx service initialized and healthy")
-    else:
-        logger.warning("Watsonx service initialized but health check failed - fallback mode available")
+    Re-entrant: returns the already initialized global instance for the same
+    model instead of repeating authentication and the health check round-trip.
     
+    Args:
+        model_id: Watsonx model identifier
+        force: Create a new service even if one is already initialized
+        
+    Returns:
+        Initialized WatsonxService
+    """
     global _watsonx_service
-    _watsonx_service = service
-    return service
\ No newline at end of file
+    
+    async with _watsonx_service_lock:
+        if (not force and _watsonx_service is not None
+                and _watsonx_service.model_id == model_id
+                and _watsonx_service.llm is not None):
+            logger.debug("Reusing initialized Watsonx service")
+            return _watsonx_service
+        
+        service = WatsonxService(model_id=model_id)
+        
+        # Perform initial health check
+        is_healthy = await service.health_check()
+        if is_healthy:
+            logger.info("Watsonx service initialized and healthy")
+        else:
+            logger.warning("Watsonx service initialized but health check failed - fallback mode available")
+        
+        _watsonx_service = service
+        return service
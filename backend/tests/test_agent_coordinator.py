@@ -0,0 +1,65 @@
+"""
+Unit tests for request coalescing in the Agent Coordinator.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from risk_analytics_agent.agent_coordinator import AgentCoordinator
+
+
+class FakeLLM:
+    """LLM stand-in; the coordinator tests never call it"""
+
+    def batch(self, inputs, config=None, return_exceptions=False):
+        raise AssertionError("unexpected LLM call")
+
+
+ASSESSMENT = {"age": 35, "income": 100000, "net_worth": 250000}
+
+
+class TestRequestCoalescing:
+    """Test suite for coalescing identical in-flight portfolio requests"""
+
+    def _coordinator(self, monkeypatch) -> AgentCoordinator:
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        coordinator = AgentCoordinator(FakeLLM())
+        coordinator.runs = 0
+
+        async def run_workflow(assessment_data: Dict[str, Any], persist_result: bool) -> Dict[str, Any]:
+            coordinator.runs += 1
+            await asyncio.sleep(0.05)
+            return {"session_id": "session-1", "success": True, "risk_analysis": {"notes": []}}
+
+        monkeypatch.setattr(coordinator, "_run_portfolio_workflow", run_workflow)
+        return coordinator
+
+    def test_identical_concurrent_requests_run_the_workflow_once(self, monkeypatch):
+        """Concurrent identical requests share one workflow run"""
+        coordinator = self._coordinator(monkeypatch)
+
+        async def run():
+            return await asyncio.gather(coordinator.process_portfolio_request(dict(ASSESSMENT)),
+                                        coordinator.process_portfolio_request(dict(ASSESSMENT)))
+
+        first, second = asyncio.run(run())
+
+        assert coordinator.runs == 1
+        assert first == second
+        assert not coordinator._inflight
+
+    def test_coalesced_callers_get_independent_results(self, monkeypatch):
+        """A caller mutating its results does not change what other callers see"""
+        coordinator = self._coordinator(monkeypatch)
+
+        results = asyncio.run(coordinator.process_portfolio_request_batch([ASSESSMENT, ASSESSMENT]))
+        results[0]["risk_analysis"]["notes"].append("mutated")
+
+        assert coordinator.runs == 1
+        assert results[0] is not results[1]
+        assert results[1]["risk_analysis"]["notes"] == []
@@ -0,0 +1,91 @@
+"""
+Unit tests for the BaseAgent result cache.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from risk_analytics_agent.base_agent import AgentContext, BaseAgent
+
+
+class FakeLLM:
+    """LLM stand-in; the test agent never calls it"""
+
+    def batch(self, inputs, config=None, return_exceptions=False):
+        raise AssertionError("unexpected LLM call")
+
+
+class EchoAgent(BaseAgent):
+    """Agent whose result reflects the market conditions and feeds a metadata queue"""
+
+    def __init__(self):
+        super().__init__(name="EchoAgent", llm=FakeLLM(), system_prompt="test")
+        self.runs = 0
+
+    async def _execute_agent_logic(self, context: AgentContext) -> Dict[str, Any]:
+        self.runs += 1
+        queue = (context.metadata or {}).get("analysis_stream")
+        if queue is not None:
+            queue.put_nowait("chunk")
+            queue.put_nowait(None)
+        return {"content": str(context.market_conditions), "structured_data": {"runs": [self.runs]}}
+
+
+ASSESSMENT = {"age": 35, "income": 100000}
+
+
+class TestResultCache:
+    """Test suite for the per-agent result cache"""
+
+    def test_repeated_request_is_served_from_cache_as_a_copy(self):
+        """A repeated context in a new session hits, and callers get their own structured data"""
+        async def run():
+            agent = EchoAgent()
+            first = await agent.process(AgentContext(session_id="s1", user_assessment=ASSESSMENT))
+            first.structured_data["runs"].append("mutated")
+            second = await agent.process(AgentContext(session_id="s2", user_assessment=ASSESSMENT))
+            return agent.runs, second
+
+        runs, second = asyncio.run(run())
+
+        assert runs == 1
+        assert second.structured_data == {"runs": [1]}
+
+    def test_market_conditions_are_part_of_the_key(self):
+        """Contexts differing only in market conditions are processed separately"""
+        async def run():
+            agent = EchoAgent()
+            low = await agent.process(AgentContext(session_id="s1", user_assessment=ASSESSMENT,
+                                                   market_conditions={"vix": 10}))
+            high = await agent.process(AgentContext(session_id="s2", user_assessment=ASSESSMENT,
+                                                    market_conditions={"vix": 40}))
+            return agent.runs, low, high
+
+        runs, low, high = asyncio.run(run())
+
+        assert runs == 2
+        assert low.content == "{'vix': 10}"
+        assert high.content == "{'vix': 40}"
+
+    def test_requests_with_metadata_bypass_the_cache(self):
+        """A request carrying a stream queue always runs the agent logic and gets its sentinel"""
+        async def run():
+            agent = EchoAgent()
+            await agent.process(AgentContext(session_id="s1", user_assessment=ASSESSMENT))
+            queue: asyncio.Queue = asyncio.Queue()
+            await agent.process(AgentContext(session_id="s2", user_assessment=ASSESSMENT,
+                                             metadata={"analysis_stream": queue}))
+            chunks = []
+            while (chunk := await asyncio.wait_for(queue.get(), timeout=1)) is not None:
+                chunks.append(chunk)
+            return agent.runs, chunks
+
+        runs, chunks = asyncio.run(run())
+
+        assert runs == 2
+        assert chunks == ["chunk"]
@@ -2,7 +2,7 @@ import os
 import sys
 import types
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import pandas as pd
 import pytest
@@ -72,7 +72,7 @@ def test_equity_selection_agent_happy_path(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setattr(esa, "ensure_data_available", lambda max_age_hours=24: True)
     monkeypatch.setattr(esa, "get_universe", lambda: _dummy_universe())
 
-    def _dummy_price_data(_tickers: List[str]) -> pd.DataFrame:
+    def _dummy_price_data(_tickers: List[str], columns: Optional[List[str]] = None) -> pd.DataFrame:
         # Minimal placeholder; real values aren't used by our dummy analyzer
         return pd.DataFrame({"date": ["2024-01-01", "2024-01-02"], "AAA": [10, 11], "BBB": [20, 21]})
 
@@ -3,6 +3,7 @@ Unit tests for Financial Ratio Calculation Engine.
 Tests all ratio calculations, validation, and edge cases.
 """
 
+import numpy as np
 import pytest
 import sys
 from pathlib import Path
@@ -216,6 +217,16 @@ class TestFinancialRatioEngine:
         assert "poor" in interpretation.lower()
         assert score <= 30
     
+    def test_nan_ratio_interpretation(self):
+        """Test NaN ratios fall below all bands, in both the scalar and the array path"""
+        for ratio_name in self.engine.benchmarks:
+            assert self.engine._interpret_ratio(ratio_name, float("nan")) == ("Below poor range", 10)
+            
+            values = np.array([np.nan, 25.0])
+            labels, scores = self.engine._interpret_ratio(ratio_name, values)
+            assert (labels[0], scores[0]) == ("Below poor range", 10)
+            assert (labels[1], scores[1]) == self.engine._interpret_ratio(ratio_name, 25.0)
+    
     def test_goal_feasibility_calculation(self):
         """Test goal feasibility ratio calculation"""
         ratios = self.engine.calculate_all_ratios(self.standard_assessment)
@@ -318,6 +329,59 @@ class TestFinancialRatioEngine:
         assert "target" in young_investment.interpretation.lower()
         assert "target" in older_investment.interpretation.lower()
 
+    def test_key_ratios_match_full_calculation(self):
+        """Test compiled key ratio kernel matches the full ratio calculation"""
+        for assessment in (self.standard_assessment, self.high_income_assessment,
+                           self.low_income_assessment, {"age": 40, "income": 0}):
+            ratios = self.engine.calculate_all_ratios(assessment)
+            key_ratios = self.engine.calculate_key_ratios(assessment)
+
+            for ratio_name, value in key_ratios.items():
+                assert abs(value - ratios[ratio_name].value) < 1e-9
+
+    def test_batch_ratios_match_full_calculation(self):
+        """Test the batch calculation matches per-assessment ratios, with NaN for errors"""
+        assessments = [self.standard_assessment, self.high_income_assessment,
+                       self.low_income_assessment, {"age": 40, "income": 0, "net_worth": -5000}]
+        batch = self.engine.calculate_all_ratios_batch(assessments)
+
+        for i, assessment in enumerate(assessments):
+            ratios = self.engine.calculate_all_ratios(assessment)
+            for ratio_name, values in batch.items():
+                expected = ratios[ratio_name]
+                if expected.calculation_method == "Error in calculation":
+                    assert np.isnan(values[i])
+                else:
+                    assert values[i] == pytest.approx(expected.value)
+
+    def test_batch_warnings_match_full_calculation(self):
+        """Test batch warning flags match the warnings of per-assessment ratios"""
+        assessments = [self.standard_assessment, self.high_income_assessment,
+                       self.low_income_assessment, {"age": 40, "income": 0, "net_worth": -5000}]
+        warnings = self.engine.calculate_ratio_warnings_batch(assessments)
+
+        for i, assessment in enumerate(assessments):
+            ratios = self.engine.calculate_all_ratios(assessment)
+            assert set(warnings) == set(ratios)
+            for ratio_name, ratio in ratios.items():
+                assert warnings[ratio_name][i] == ratio.warning_flags
+
+    def test_ratio_results_are_cached_until_benchmarks_change(self):
+        """Test repeated calculations share immutable results and benchmark updates invalidate them"""
+        first = self.engine.calculate_all_ratios(self.standard_assessment)
+        second = self.engine.calculate_all_ratios(dict(self.standard_assessment))
+
+        assert first is not second
+        assert first["savings_rate"] is second["savings_rate"]
+        with pytest.raises(AttributeError):
+            first["savings_rate"].value = 0
+
+        self.engine.update_benchmarks("savings_rate", {
+            "excellent": (50, 100), "good": (40, 50), "fair": (30, 40), "poor": (0, 30)
+        })
+        updated = self.engine.calculate_all_ratios(self.standard_assessment)
+        assert updated["savings_rate"].interpretation.startswith("Poor")
+
 
 if __name__ == "__main__":
     # Run tests if executed directly
@@ -0,0 +1,106 @@
+"""
+Unit tests for the dependency-driven pipeline executor.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from risk_analytics_agent.pipeline import PipelineStep, run_dag
+
+
+class TestRunDag:
+    """Test suite for run_dag"""
+
+    def test_results_and_dependency_arguments(self):
+        """Steps receive their dependency results as keyword arguments"""
+        async def value(x):
+            return x
+
+        async def add(a, b):
+            return a + b
+
+        steps = [
+            PipelineStep(name="total", run=add, deps=("a", "b")),
+            PipelineStep(name="a", run=lambda: value(2)),
+            PipelineStep(name="b", run=lambda: value(3)),
+        ]
+
+        results = asyncio.run(run_dag(steps))
+
+        assert results == {"a": 2, "b": 3, "total": 5}
+
+    def test_independent_steps_run_concurrently(self):
+        """Independent steps overlap instead of running back to back"""
+        running = 0
+        peak = 0
+
+        async def slow():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+
+        steps = [PipelineStep(name=f"step_{i}", run=slow) for i in range(3)]
+        asyncio.run(run_dag(steps))
+
+        assert peak == 3
+
+    def test_failure_cancels_remaining_steps(self):
+        """The first failure is raised and pending steps are cancelled"""
+        cancelled = []
+
+        async def fail():
+            raise ValueError("boom")
+
+        async def wait_forever():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        steps = [
+            PipelineStep(name="fail", run=fail),
+            PipelineStep(name="slow", run=wait_forever),
+        ]
+
+        with pytest.raises(ValueError, match="boom"):
+            asyncio.run(run_dag(steps))
+        assert cancelled == [True]
+
+    def test_dependency_failure_raised_once(self):
+        """A failing step surfaces its own error even when others depend on it"""
+        async def fail():
+            raise ValueError("upstream")
+
+        async def downstream(source):
+            return source
+
+        steps = [
+            PipelineStep(name="source", run=fail),
+            PipelineStep(name="sink", run=downstream, deps=("source",)),
+        ]
+
+        with pytest.raises(ValueError, match="upstream"):
+            asyncio.run(run_dag(steps))
+
+    def test_invalid_graphs_rejected(self):
+        """Unknown dependencies and cycles are reported before running"""
+        async def noop(**_):
+            return None
+
+        with pytest.raises(ValueError, match="unknown step"):
+            asyncio.run(run_dag([PipelineStep(name="a", run=noop, deps=("missing",))]))
+
+        with pytest.raises(ValueError, match="cycle"):
+            asyncio.run(run_dag([
+                PipelineStep(name="a", run=noop, deps=("b",)),
+                PipelineStep(name="b", run=noop, deps=("a",)),
+            ]))
@@ -222,7 +222,7 @@ async def test_agent_coordinator():
         
         # Test coordinator status
         print(f"\n📊 Coordinator Status:")
-        status = coordinator.get_agent_status()
+        status = await coordinator.get_agent_status()
         print(f"   - Active Sessions: {status['active_sessions']}")
         print(f"   - Coordinator Status: {status['coordinator_status']}")
         
@@ -48,7 +48,8 @@ def create_watsonx_llm(
     top_p: float = 0.9,
     top_k: int = 50,
     repetition_penalty: float = 1.0,
-    custom_params: Optional[Dict[str, Any]] = None
+    custom_params: Optional[Dict[str, Any]] = None,
+    async_httpx_client: Optional[Any] = None
 ) -> ChatWatsonx:
     """
     Create and configure a ChatWatsonx instance using APIClient.
@@ -61,6 +62,8 @@ def create_watsonx_llm(
         top_k: Top-k sampling parameter
         repetition_penalty: Repetition penalty factor
         custom_params: Additional custom parameters to override defaults
+        async_httpx_client: Shared httpx.AsyncClient for async calls, so several
+            LLM instances reuse one connection pool
     
     Returns:
         Configured ChatWatsonx instance
@@ -89,10 +92,15 @@ def create_watsonx_llm(
         api_key=env_vars['WATSONX_APIKEY']
     )
     
+    client_kwargs = {}
+    if async_httpx_client is not None:
+        client_kwargs['async_httpx_client'] = async_httpx_client
+    
     client = APIClient(
         credentials, 
         api_key=env_vars['WATSONX_APIKEY'], 
-        project_id=env_vars['WATSONX_PROJECT_ID']
+        project_id=env_vars['WATSONX_PROJECT_ID'],
+        **client_kwargs
     )
     
     # Create ChatWatsonx instance
@@ -297,32 +305,48 @@ if __name__ == "__main__":
     """
     Example usage and testing
     """
+    import io
+    import sys
+    
+    # Buffer output and write it once per section instead of per line
+    buf = io.StringIO()
+    
+    def flush_output() -> None:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+        buf.seek(0)
+        buf.truncate()
+    
     try:
-        print("Creating Watsonx models...")
+        buf.write("Creating Watsonx models...\n")
+        flush_output()
         
         # Create models using default configuration
         llm, embeddings = create_models_by_config("default")
         
-        print("Models created successfully!")
-        print(f"LLM Model: {llm.model_id}")
-        print(f"Embedding Model: {embeddings.model_id}")
+        buf.write("Models created successfully!\n")
+        buf.write(f"LLM Model: {llm.model_id}\n")
+        buf.write(f"Embedding Model: {embeddings.model_id}\n")
         
         # Test the models
-        print("\nTesting models...")
+        buf.write("\nTesting models...\n")
+        flush_output()
         test_results = test_models(llm, embeddings)
         
-        print("\nTest Results:")
+        buf.write("\nTest Results:\n")
         for test_name, result in test_results.items():
-            print(f"\n{test_name.upper()}:")
+            buf.write(f"\n{test_name.upper()}:\n")
             if result["success"]:
-                print("✅ Success")
+                buf.write("✅ Success\n")
                 for key, value in result.items():
                     if key != "success":
-                        print(f"  {key}: {value}")
+                        buf.write(f"  {key}: {value}\n")
             else:
-                print("❌ Failed")
-                print(f"  Error: {result['error']}")
+                buf.write("❌ Failed\n")
+                buf.write(f"  Error: {result['error']}\n")
+        flush_output()
                 
     except Exception as e:
-        print(f"Error: {e}")
-        print("Make sure your .env file is properly configured with valid credentials.")
+        buf.write(f"Error: {e}\n")
+        buf.write("Make sure your .env file is properly configured with valid credentials.\n")
+        flush_output()